@@ -1,199 +1,463 @@
 from __future__ import annotations
 
-from typing import Any, Dict, List
-
-
-def _get_utility_guidance_comments(utility: Dict[str, Any]) -> List[str]:
-    """Generate specific guidance comments based on utility type."""
-    name = utility.get("name", "").lower()
-    description = utility.get("description", "").lower()
-
-    # Detect utility patterns and provide specific guidance
-    if any(
-        keyword in name or keyword in description
-        for keyword in ["llm", "ai", "chat", "completion"]
-    ):
-        return [
-            "GUIDANCE: For LLM utilities, keep prompts simple and transparent.",
-            "- Pass prompts as clear parameters, don't construct them internally",
-            "- Avoid complex reasoning chains or decision logic",
-            "- Let nodes handle prompt construction and result processing",
-        ]
-
-    if any(
-        keyword in name or keyword in description
-        for keyword in ["file", "read", "write", "load", "save"]
-    ):
-        return [
-            "GUIDANCE: For file utilities, focus on simple I/O operations.",
-            "- Handle basic file reading/writing/parsing",
-            "- Keep error handling simple (let exceptions bubble up)",
-            "- Avoid complex file processing logic",
-        ]
-
-    if any(
-        keyword in name or keyword in description
-        for keyword in ["api", "http", "request", "fetch", "client"]
-    ):
-        return [
-            "GUIDANCE: For API utilities, provide clean service interfaces.",
-            "- Focus on request/response handling",
-            "- Keep authentication and retry logic simple",
-            "- Avoid business logic or complex response processing",
-        ]
-
-    if any(
-        keyword in name or keyword in description
-        for keyword in ["parse", "format", "convert", "transform"]
-    ):
-        return [
-            "GUIDANCE: For data utilities, focus on simple transformations.",
-            "- Handle straightforward data format conversions",
-            "- Avoid complex data validation or business rules",
-            "- Keep transformations stateless and predictable",
-        ]
-
-    # Generic guidance
-    return [
+from functools import lru_cache
+from itertools import pairwise
+from types import MappingProxyType
+from typing import (
+    Any,
+    Dict,
+    List,
+    Mapping,
+    Optional,
+    Tuple,
+)
+
+# Keyword groups used to classify utilities, in priority order. "client" only
+# selects the API guidance comments, not the API implementation example.
+# The order decides the category when several groups match, so it must not be
+# rearranged by hit frequency; only keywords within one group may move.
+_UTILITY_CATEGORY_KEYWORDS = (
+    ("llm", ("llm", "ai", "chat", "completion")),
+    ("file", ("file", "read", "write", "load", "save")),
+    ("api", ("api", "http", "request", "fetch")),
+    ("client", ("client",)),
+    ("data", ("parse", "format", "convert", "transform")),
+)
+# The same table flattened once at import into (keyword, category) pairs, so
+# classification is a single loop with no nested iteration
+_UTILITY_KEYWORD_CATEGORIES = tuple(
+    (keyword, category)
+    for category, keywords in _UTILITY_CATEGORY_KEYWORDS
+    for keyword in keywords
+)
+
+# Description keywords that make generate_utility emit an async function. Most
+# descriptions match none of them, so every check runs and order is irrelevant
+_ASYNC_UTILITY_KEYWORDS = (
+    "llm",
+    "api",
+    "database",
+    "file",
+    "network",
+    "http",
+    "fetch",
+    "request",
+)
+
+_API_GUIDANCE_COMMENTS = (
+    "GUIDANCE: For API utilities, provide clean service interfaces.",
+    "- Focus on request/response handling",
+    "- Keep authentication and retry logic simple",
+    "- Avoid business logic or complex response processing",
+)
+_UTILITY_GUIDANCE_COMMENTS = {
+    "llm": (
+        "GUIDANCE: For LLM utilities, keep prompts simple and transparent.",
+        "- Pass prompts as clear parameters, don't construct them internally",
+        "- Avoid complex reasoning chains or decision logic",
+        "- Let nodes handle prompt construction and result processing",
+    ),
+    "file": (
+        "GUIDANCE: For file utilities, focus on simple I/O operations.",
+        "- Handle basic file reading/writing/parsing",
+        "- Keep error handling simple (let exceptions bubble up)",
+        "- Avoid complex file processing logic",
+    ),
+    "api": _API_GUIDANCE_COMMENTS,
+    "client": _API_GUIDANCE_COMMENTS,
+    "data": (
+        "GUIDANCE: For data utilities, focus on simple transformations.",
+        "- Handle straightforward data format conversions",
+        "- Avoid complex data validation or business rules",
+        "- Keep transformations stateless and predictable",
+    ),
+    "generic": (
         "GUIDANCE: Keep this utility simple and focused.",
         "- Perform one clear operation",
         "- Avoid hidden complexity or side effects",
         "- Let nodes coordinate multiple utility calls",
-    ]
-
+    ),
+}
+
+# Implementation examples keyed by (category, is_async); other categories fall
+# back to the generic guidance
+_UTILITY_IMPLEMENTATION_GUIDANCE = {
+    ("llm", True): (
+        "    # EXAMPLE: Simple async LLM call pattern",
+        "    # from openai import AsyncOpenAI",
+        "    # client = AsyncOpenAI()",
+        "    # response = await client.chat.completions.create(",
+        "    #     model='gpt-4',",
+        "    #     messages=[{'role': 'user', 'content': prompt}]",
+        "    # )",
+        "    # return response.choices[0].message.content",
+    ),
+    ("llm", False): (
+        "    # EXAMPLE: Simple sync LLM call pattern",
+        "    # from openai import OpenAI",
+        "    # client = OpenAI()",
+        "    # response = client.chat.completions.create(",
+        "    #     model='gpt-4',",
+        "    #     messages=[{'role': 'user', 'content': prompt}]",
+        "    # )",
+        "    # return response.choices[0].message.content",
+    ),
+    ("file", True): (
+        "    # EXAMPLE: Simple async file operations",
+        "    # import aiofiles",
+        "    # async with aiofiles.open(file_path, 'r') as f:",
+        "    #     content = await f.read()",
+        "    # return content",
+    ),
+    ("file", False): (
+        "    # EXAMPLE: Simple sync file operations",
+        "    # with open(file_path, 'r') as f:",
+        "    #     content = f.read()",
+        "    # return content",
+    ),
+    ("api", True): (
+        "    # EXAMPLE: Simple async HTTP request",
+        "    # import httpx",
+        "    # async with httpx.AsyncClient() as client:",
+        "    #     response = await client.get(url)",
+        "    #     return response.json()",
+    ),
+    ("api", False): (
+        "    # EXAMPLE: Simple sync HTTP request",
+        "    # import requests",
+        "    # response = requests.get(url)",
+        "    # return response.json()",
+    ),
+}
+_GENERIC_IMPLEMENTATION_GUIDANCE = (
+    "    # IMPLEMENTATION GUIDANCE:",
+    "    # - Keep the logic simple and focused on one task",
+    "    # - Use clear variable names and minimal complexity",
+    "    # - Let exceptions bubble up for retry handling",
+)
+
+
+# Static blocks of the generated sources, spelled as adjacent literals with
+# explicit newlines. Each is emitted as a single element of the generator's
+# line list, so "\n".join gives the same text as listing the lines one by one.
+_UTILITY_MODULE_PREAMBLE = (
+    "\n"
+    "BEST PRACTICE: Keep utility functions simple and transparent.\n"
+    "DO NOT: Hide complex reasoning or decision logic here.\n"
+    "Complex prompt construction belongs in nodes, not utilities.\n"
+    "\n"
+    "UTILITY RESPONSIBILITIES:\n"
+    "- Simple I/O operations (file read/write, API calls)\n"
+    "- Data formatting and parsing\n"
+    "- External service interfaces\n"
+    "\n"
+    "AVOID IN UTILITIES:\n"
+    "- Business logic or multi-step workflows\n"
+    "- Complex LLM reasoning or prompt construction\n"
+    "- State management (use SharedStore in nodes)\n"
+    "- Flow control or branching logic\n"
+    '"""\n'
+    "\n"
+    "from typing import Any, Dict, List, Optional, Tuple, Union\n"
+    "\n"
+)
+
+_UTILITY_TODO_GUIDANCE = (
+    "    # \n"
+    "    # FRAMEWORK GUIDANCE: This TODO is intentional. The Agent OS + PocketFlow\n"
+    "    # framework provides templates and structure, but YOU implement the specific\n"
+    "    # business logic for your use case.\n"
+    "    #\n"
+    "    # Why? This ensures maximum flexibility and prevents vendor lock-in.\n"
+    "    # \n"
+    "    # Next Steps:\n"
+    "    # 1. Review docs/design.md for your specific requirements\n"
+    "    # 2. Follow PocketFlow utility patterns: simple, focused functions\n"
+    "    # 3. See ~/.agent-os/standards/best-practices.md for patterns"
+)
+
+# Static router module header around the spec-specific flow import
+_ROUTER_MODULE_IMPORTS = (
+    "from fastapi import APIRouter, HTTPException\nfrom .schemas.models import *"
+)
+
+_ROUTER_MODULE_SETUP = (
+    "from typing import Dict, Any\n"
+    "import logging\n"
+    "from datetime import datetime, timezone\n"
+    "\n"
+    "logger = logging.getLogger(__name__)\n"
+    "router = APIRouter()\n"
+)
+
+# Static module headers of the generated models and nodes files, up to and
+# including the blank lines before their first class
+_MODELS_MODULE_HEADER = (
+    "from pydantic import BaseModel, Field, validator\n"
+    "from typing import Dict, List, Optional, Any\n"
+    "from datetime import datetime\n"
+    "\n"
+    "\n"
+    "class SharedStoreModel(BaseModel):\n"
+    '    """Pydantic model for SharedStore validation."""\n'
+)
+
+_NODES_MODULE_HEADER = (
+    "from pocketflow import Node, AsyncNode, BatchNode\n"
+    "from typing import Dict, Any, Optional\n"
+    "import logging\n"
+    "\n"
+    "logger = logging.getLogger(__name__)\n"
+    "\n"
+)
+
+_ROUTER_ENDPOINT_PREAMBLE = (
+    '    """\n'
+    "    # TODO: Add authentication and authorization logic here\n"
+    "    # \n"
+    "    # FRAMEWORK GUIDANCE: This TODO is intentional. The Agent OS + PocketFlow\n"
+    "    # framework provides templates and structure, but YOU implement the specific\n"
+    "    # business logic for your use case.\n"
+    "    #\n"
+    "    # Why? This ensures maximum flexibility and prevents vendor lock-in.\n"
+    "    # \n"
+    "    # Next Steps:\n"
+    "    # 1. Review docs/design.md for your specific requirements\n"
+    "    # 2. Implement auth strategy (JWT, OAuth, API keys, etc.)\n"
+    "    # 3. See ~/.agent-os/standards/best-practices.md for patterns\n"
+    "    \n"
+    "    # TODO: Add input validation and sanitization\n"
+    "    # \n"
+    "    # FRAMEWORK GUIDANCE: This TODO is intentional. The Agent OS + PocketFlow\n"
+    "    # framework provides templates and structure, but YOU implement the specific\n"
+    "    # business logic for your use case.\n"
+    "    #\n"
+    "    # Why? This ensures maximum flexibility and prevents vendor lock-in.\n"
+    "    # \n"
+    "    # Next Steps:\n"
+    "    # 1. Review docs/design.md for your specific requirements\n"
+    "    # 2. Add Pydantic validators or custom validation logic\n"
+    "    # 3. See ~/.agent-os/standards/best-practices.md for patterns\n"
+    "    \n"
+    "    # Initialize SharedStore\n"
+    "    shared = {\n"
+    '        "request_data": request.model_dump(),\n'
+    '        "timestamp": datetime.now(timezone.utc).isoformat()\n'
+    "    }\n"
+    "\n"
+    "    # Execute workflow - let PocketFlow handle retries and errors"
+)
+
+_ROUTER_ENDPOINT_EPILOGUE = (
+    "    await flow.run_async(shared)\n"
+    "\n"
+    "    # TODO: Customize error handling and response codes\n"
+    "    # \n"
+    "    # FRAMEWORK GUIDANCE: This TODO is intentional. The Agent OS + PocketFlow\n"
+    "    # framework provides templates and structure, but YOU implement the specific\n"
+    "    # business logic for your use case.\n"
+    "    #\n"
+    "    # Why? This ensures maximum flexibility and prevents vendor lock-in.\n"
+    "    # \n"
+    "    # Next Steps:\n"
+    "    # 1. Review docs/design.md for your specific requirements\n"
+    "    # 2. Follow FastAPI error handling patterns\n"
+    "    # 3. See ~/.agent-os/standards/best-practices.md for patterns\n"
+    "    # Check for flow-level errors\n"
+    '    if "error" in shared:\n'
+    "        raise HTTPException(\n"
+    "            status_code=422,\n"
+    '            detail=shared.get("error_message", "Workflow execution failed")\n'
+    "        )\n"
+    "\n"
+    "    # Return response"
+)
+
+
+_NODE_PREP_DOC = (
+    "    def prep(self, shared: Dict[str, Any]) -> Any:\n"
+    '        """\n'
+    "        Data preparation and validation.\n"
+    "        \n"
+    "        BEST PRACTICE: Only read from shared store here.\n"
+    "        DO NOT: Perform computation or external calls.\n"
+    "        DO NOT: Access databases, APIs, or call LLMs.\n"
+    "        \n"
+    "        This method should be fast, synchronous, and focused on\n"
+    "        extracting the exact data needed for exec().\n"
+    '        """'
+)
+
+_NODE_EXEC_DOC = (
+    '        """\n'
+    "        Core processing logic.\n"
+    "        \n"
+    "        BEST PRACTICE: Use only prep_result as input.\n"
+    "        DO NOT: Access shared store directly.\n"
+    "        DO NOT: Use try/except for flow control.\n"
+    "        \n"
+    "        Let exceptions bubble up for PocketFlow retry handling.\n"
+    "        Use return values and post() for business logic branching.\n"
+    '        """'
+)
+
+_NODE_POST_DOC = (
+    "    def post(self, shared: Dict[str, Any], prep_result: Any, exec_result: Any) -> Optional[str]:\n"
+    '        """\n'
+    "        Post-processing and result storage.\n"
+    "        \n"
+    "        BEST PRACTICE: Store results in shared store and return flow signals.\n"
+    "        DO NOT: Perform heavy computation here.\n"
+    "        DO NOT: Call external APIs or services.\n"
+    "        \n"
+    '        Use return values to signal flow branching (e.g., "success", "retry", "error").\n'
+    "        Keep this method fast and focused on data storage and routing.\n"
+    '        """'
+)
+
+# Blank line plus the guidance comment that opens each method's TODO list
+_NODE_PREP_GUIDANCE_HEADER = (
+    "\n        # Framework guidance: Read only what exec() needs from shared store"
+)
+_NODE_EXEC_GUIDANCE_HEADER = (
+    "\n        # Framework guidance: Process prep_result, avoid shared store access"
+)
+_NODE_POST_GUIDANCE_HEADER = "\n        # Framework guidance: Store exec_result in shared store, return flow signal"
+
+# Two blank lines closing each generated class
+_NODE_CLASS_END = "\n"
+
+# Default TODOs per node method when the spec provides no enhanced TODOs
+_NODE_BASE_PREP_TODOS = (
+    "# TODO: Extract the exact data exec() needs from shared store",
+    "# TODO: Consider input validation if needed (but keep it lightweight)",
+)
+_NODE_BASE_EXEC_TODOS = (
+    "# TODO: Implement the core processing logic using only prep_result",
+    "# TODO: Return the processed result (avoid side effects here)",
+)
+_NODE_BASE_POST_TODOS = (
+    "# TODO: Store exec_result in shared store with appropriate key",
+    "# TODO: Return flow signal for branching ('success', 'error', specific state)",
+)
+
+# TODO lines sit in the method body; a block of them is emitted as one string
+_NODE_TODO_INDENT = "        "
+_NODE_TODO_SEPARATOR = "\n" + _NODE_TODO_INDENT
+
+# The default TODOs pre-indented and joined
+_NODE_BASE_PREP_TODO_BLOCK = _NODE_TODO_INDENT + _NODE_TODO_SEPARATOR.join(
+    _NODE_BASE_PREP_TODOS
+)
+_NODE_BASE_EXEC_TODO_BLOCK = _NODE_TODO_INDENT + _NODE_TODO_SEPARATOR.join(
+    _NODE_BASE_EXEC_TODOS
+)
+_NODE_BASE_POST_TODO_BLOCK = _NODE_TODO_INDENT + _NODE_TODO_SEPARATOR.join(
+    _NODE_BASE_POST_TODOS
+)
+
+# Framework guidance emitted after the TODOs of every node method
+_NODE_FRAMEWORK_GUIDANCE = "\n".join(
+    f"        {line}"
+    for line in (
+        "# ",
+        "# FRAMEWORK GUIDANCE: These TODOs are intentional. The Agent OS + PocketFlow",
+        "# framework provides templates and structure, but YOU implement the specific",
+        "# business logic for your use case.",
+        "#",
+        "# Why? This ensures maximum flexibility and prevents vendor lock-in.",
+        "# ",
+        "# Next Steps:",
+        "# 1. Review docs/design.md for your specific requirements",
+        "# 2. Follow PocketFlow node lifecycle: prep() → exec() → post()",
+        "# 3. See ~/.agent-os/standards/best-practices.md for patterns",
+    )
+)
+
+_FLOW_NODES_PREAMBLE = (
+    "\n"
+    "    def __init__(self):\n"
+    "        # TODO: Customize node instances and their configurations\n"
+    "        # \n"
+    "        # FRAMEWORK GUIDANCE: This TODO is intentional. The Agent OS + PocketFlow\n"
+    "        # framework provides templates and structure, but YOU implement the specific\n"
+    "        # business logic for your use case.\n"
+    "        #\n"
+    "        # Why? This ensures maximum flexibility and prevents vendor lock-in.\n"
+    "        # \n"
+    "        # Next Steps:\n"
+    "        # 1. Review docs/design.md for your specific requirements\n"
+    "        # 2. Configure node parameters based on your domain needs\n"
+    "        # 3. See ~/.agent-os/standards/best-practices.md for patterns\n"
+    "        nodes = {"
+)
+
+_FLOW_EDGES_PREAMBLE = (
+    "        }\n"
+    "\n"
+    "        # TODO: Customize workflow connections and error handling\n"
+    "        # \n"
+    "        # FRAMEWORK GUIDANCE: This TODO is intentional. The Agent OS + PocketFlow\n"
+    "        # framework provides templates and structure, but YOU implement the specific\n"
+    "        # business logic for your use case.\n"
+    "        #\n"
+    "        # Why? This ensures maximum flexibility and prevents vendor lock-in.\n"
+    "        # \n"
+    "        # Next Steps:\n"
+    "        # 1. Review docs/design.md for your specific requirements\n"
+    "        # 2. Follow PocketFlow flow lifecycle: init() → run_async() → cleanup()\n"
+    "        # 3. See ~/.agent-os/standards/best-practices.md for patterns\n"
+    "        edges = {"
+)
+
+_FLOW_EPILOGUE = "        }\n\n        super().__init__(nodes=nodes, edges=edges)\n\n"
+
+
+@lru_cache(maxsize=1024)
+def _classify_utility_text(name_lower: str, description_lower: str) -> str:
+    """Classify an already-lowercased utility name/description pair (memoized)."""
+    # Plain substring checks beat a regex or automaton for a handful of short
+    # keywords; the NUL separator keeps keywords from spanning both fields
+    text = f"{name_lower}\0{description_lower}"
+    for keyword, category in _UTILITY_KEYWORD_CATEGORIES:
+        if keyword in text:
+            return category
+    return "generic"
+
+
+@lru_cache(maxsize=1024)
+def _describes_async_io(description_lower: str) -> bool:
+    """Return True if a lowercased utility description mentions I/O-bound work.
+
+    Memoized like _classify_utility_text: pattern utilities recur verbatim.
+    """
+    for keyword in _ASYNC_UTILITY_KEYWORDS:
+        if keyword in description_lower:
+            return True
+    return False
 
-def _get_utility_implementation_guidance(
-    utility: Dict[str, Any], is_async: bool
-) -> List[str]:
-    """Generate implementation guidance comments based on utility characteristics."""
-    name = utility.get("name", "").lower()
-    description = utility.get("description", "").lower()
-    guidance = []
-
-    # LLM-specific guidance
-    if any(
-        keyword in name or keyword in description
-        for keyword in ["llm", "ai", "chat", "completion"]
-    ):
-        if is_async:
-            guidance.extend(
-                [
-                    "    # EXAMPLE: Simple async LLM call pattern",
-                    "    # from openai import AsyncOpenAI",
-                    "    # client = AsyncOpenAI()",
-                    "    # response = await client.chat.completions.create(",
-                    "    #     model='gpt-4',",
-                    "    #     messages=[{'role': 'user', 'content': prompt}]",
-                    "    # )",
-                    "    # return response.choices[0].message.content",
-                ]
-            )
-        else:
-            guidance.extend(
-                [
-                    "    # EXAMPLE: Simple sync LLM call pattern",
-                    "    # from openai import OpenAI",
-                    "    # client = OpenAI()",
-                    "    # response = client.chat.completions.create(",
-                    "    #     model='gpt-4',",
-                    "    #     messages=[{'role': 'user', 'content': prompt}]",
-                    "    # )",
-                    "    # return response.choices[0].message.content",
-                ]
-            )
 
-    # File I/O guidance
-    elif any(
-        keyword in name or keyword in description
-        for keyword in ["file", "read", "write", "load", "save"]
-    ):
-        if is_async:
-            guidance.extend(
-                [
-                    "    # EXAMPLE: Simple async file operations",
-                    "    # import aiofiles",
-                    "    # async with aiofiles.open(file_path, 'r') as f:",
-                    "    #     content = await f.read()",
-                    "    # return content",
-                ]
-            )
-        else:
-            guidance.extend(
-                [
-                    "    # EXAMPLE: Simple sync file operations",
-                    "    # with open(file_path, 'r') as f:",
-                    "    #     content = f.read()",
-                    "    # return content",
-                ]
-            )
+def _get_utility_guidance_comments(category: str) -> List[str]:
+    """Generate specific guidance comments based on utility type."""
+    return list(_UTILITY_GUIDANCE_COMMENTS[category])
 
-    # API guidance
-    elif any(
-        keyword in name or keyword in description
-        for keyword in ["api", "http", "request", "fetch"]
-    ):
-        if is_async:
-            guidance.extend(
-                [
-                    "    # EXAMPLE: Simple async HTTP request",
-                    "    # import httpx",
-                    "    # async with httpx.AsyncClient() as client:",
-                    "    #     response = await client.get(url)",
-                    "    #     return response.json()",
-                ]
-            )
-        else:
-            guidance.extend(
-                [
-                    "    # EXAMPLE: Simple sync HTTP request",
-                    "    # import requests",
-                    "    # response = requests.get(url)",
-                    "    # return response.json()",
-                ]
-            )
 
-    # Generic implementation guidance
-    else:
-        guidance.extend(
-            [
-                "    # IMPLEMENTATION GUIDANCE:",
-                "    # - Keep the logic simple and focused on one task",
-                "    # - Use clear variable names and minimal complexity",
-                "    # - Let exceptions bubble up for retry handling",
-            ]
+def _get_utility_implementation_guidance(category: str, is_async: bool) -> List[str]:
+    """Generate implementation guidance comments based on utility characteristics."""
+    return list(
+        _UTILITY_IMPLEMENTATION_GUIDANCE.get(
+            (category, bool(is_async)), _GENERIC_IMPLEMENTATION_GUIDANCE
         )
-
-    return guidance
+    )
 
 
-def generate_utility(utility: Dict[str, Any]) -> str:
-    """Generate utility function from specification.
-
-    Mirrors the legacy _generate_utility method to preserve parity.
-    """
+def _build_utility_lines(utility: Dict[str, Any]) -> List[str]:
+    """Build the lines of the generated utility module source."""
+    description = utility["description"]
     utility_code: List[str] = [
         '"""',
-        f"{utility['description']}",
-        "",
-        "BEST PRACTICE: Keep utility functions simple and transparent.",
-        "DO NOT: Hide complex reasoning or decision logic here.",
-        "Complex prompt construction belongs in nodes, not utilities.",
-        "",
-        "UTILITY RESPONSIBILITIES:",
-        "- Simple I/O operations (file read/write, API calls)",
-        "- Data formatting and parsing",
-        "- External service interfaces",
-        "",
-        "AVOID IN UTILITIES:",
-        "- Business logic or multi-step workflows",
-        "- Complex LLM reasoning or prompt construction",
-        "- State management (use SharedStore in nodes)",
-        "- Flow control or branching logic",
-        '"""',
-        "",
-        "from typing import Any, Dict, List, Optional, Tuple, Union",
-        "",
-        "",
+        f"{description}",
+        _UTILITY_MODULE_PREAMBLE,
     ]
 
     # Function signature
@@ -205,33 +469,23 @@ def generate_utility(utility: Dict[str, Any]) -> str:
             params.append(f"{param['name']}: {param['type']}")
 
     # Determine if utility should be async based on description or explicit flag
-    is_async_utility = utility.get("async", False) or any(
-        keyword in utility["description"].lower()
-        for keyword in [
-            "llm",
-            "api",
-            "database",
-            "file",
-            "network",
-            "http",
-            "fetch",
-            "request",
-        ]
+    # Lowercase the name and description once for every keyword check below
+    description_lower = description.lower()
+    category = _classify_utility_text(
+        utility.get("name", "").lower(), description_lower
     )
-
-    func_def = (
-        f"async def {utility['name']}("
-        if is_async_utility
-        else f"def {utility['name']}("
+    is_async_utility = utility.get("async", False) or _describes_async_io(
+        description_lower
     )
+
+    name = utility["name"]
+    func_def = f"async def {name}(" if is_async_utility else f"def {name}("
     test_call = (
-        f"    # asyncio.run({utility['name']}())"
-        if is_async_utility
-        else f"    # {utility['name']}()"
+        f"    # asyncio.run({name}())" if is_async_utility else f"    # {name}()"
     )
 
     # Generate specific guidance based on utility type
-    guidance_comments = _get_utility_guidance_comments(utility)
+    guidance_comments = _get_utility_guidance_comments(category)
 
     utility_code.extend(
         [
@@ -239,7 +493,7 @@ def generate_utility(utility: Dict[str, Any]) -> str:
             f"    {', '.join(params)}",
             f") -> {utility.get('return_type', 'Any')}:",
             '    """',
-            f"    {utility['description']}",
+            f"    {description}",
             "",
         ]
         + guidance_comments
@@ -251,28 +505,18 @@ def generate_utility(utility: Dict[str, Any]) -> str:
     )
 
     # Add specific implementation guidance
-    impl_guidance = _get_utility_implementation_guidance(utility, is_async_utility)
+    impl_guidance = _get_utility_implementation_guidance(category, is_async_utility)
     utility_code.extend(impl_guidance)
 
     utility_code.extend(
         [
-            f"    # TODO: Implement {utility['name']}",
-            "    # ",
-            "    # FRAMEWORK GUIDANCE: This TODO is intentional. The Agent OS + PocketFlow",
-            "    # framework provides templates and structure, but YOU implement the specific",
-            "    # business logic for your use case.",
-            "    #",
-            "    # Why? This ensures maximum flexibility and prevents vendor lock-in.",
-            "    # ",
-            "    # Next Steps:",
-            "    # 1. Review docs/design.md for your specific requirements",
-            "    # 2. Follow PocketFlow utility patterns: simple, focused functions",
-            "    # 3. See ~/.agent-os/standards/best-practices.md for patterns",
-            f'    raise NotImplementedError("Utility function {utility["name"]} not implemented")',
+            f"    # TODO: Implement {name}",
+            _UTILITY_TODO_GUIDANCE,
+            f'    raise NotImplementedError("Utility function {name} not implemented")',
             "",
             "",
             'if __name__ == "__main__":',
-            f"    # Test {utility['name']} function",
+            f"    # Test {name} function",
         ]
     )
 
@@ -281,134 +525,88 @@ def generate_utility(utility: Dict[str, Any]) -> str:
     else:
         utility_code.extend([test_call, "    pass"])
 
-    return "\n".join(utility_code)
+    return utility_code
+
+
+def generate_utility(utility: Dict[str, Any]) -> str:
+    """Generate utility function from specification.
+
+    Mirrors the legacy _generate_utility method to preserve parity.
+    """
+    return "\n".join(_build_utility_lines(utility))
 
 
 def generate_fastapi_main(spec) -> str:
     """Generate FastAPI main application (legacy parity)."""
-    main_code = [
-        "from fastapi import FastAPI, HTTPException",
-        "from fastapi.middleware.cors import CORSMiddleware",
-        f"from .router import router as {spec.name.lower()}_router",
-        "import logging",
-        "",
-        "logging.basicConfig(level=logging.INFO)",
-        "",
-        "app = FastAPI(",
-        f'    title="{spec.name} API",',
-        f'    description="{spec.description}",',
-        '    version="1.0.0"',
-        ")",
-        "",
-        "app.add_middleware(",
-        "    CORSMiddleware,",
-        '    allow_origins=["*"],',
-        "    allow_credentials=True,",
-        '    allow_methods=["*"],',
-        '    allow_headers=["*"],',
-        ")",
-        "",
-        f'app.include_router({spec.name.lower()}_router, prefix="/api/v1", tags=["{spec.name}"])',
-        "",
-        '@app.get("/health")',
-        "async def health_check():",
-        '    return {"status": "healthy"}',
-    ]
-
-    return "\n".join(main_code)
+    router_name = f"{spec.name.lower()}_router"
+    return f'''from fastapi import FastAPI, HTTPException
+from fastapi.middleware.cors import CORSMiddleware
+from .router import router as {router_name}
+import logging
+
+logging.basicConfig(level=logging.INFO)
+
+app = FastAPI(
+    title="{spec.name} API",
+    description="{spec.description}",
+    version="1.0.0"
+)
+
+app.add_middleware(
+    CORSMiddleware,
+    allow_origins=["*"],
+    allow_credentials=True,
+    allow_methods=["*"],
+    allow_headers=["*"],
+)
+
+app.include_router({router_name}, prefix="/api/v1", tags=["{spec.name}"])
+
+@app.get("/health")
+async def health_check():
+    return {{"status": "healthy"}}'''
+
+
+def _render_router_endpoint(spec_name: str, endpoint: Dict[str, Any]) -> str:
+    """Render one endpoint block of the FastAPI router as a single string."""
+    method = endpoint.get("method", "post").lower()
+    endpoint_name = endpoint["name"]
+    # Lowercase the name once for both the default path and the handler name
+    endpoint_key = endpoint_name.lower()
+    path = endpoint.get("path", f"/{endpoint_key}")
+    description = endpoint.get("description", f"Execute {endpoint_name} workflow")
+
+    return (
+        f'@router.{method}("{path}", response_model={endpoint_name}Response)\n'
+        f"async def {endpoint_key}_endpoint(request: {endpoint_name}Request):\n"
+        '    """\n'
+        f"    {description}\n"
+        f"{_ROUTER_ENDPOINT_PREAMBLE}\n"
+        f"    flow = {spec_name}Flow()\n"
+        f"{_ROUTER_ENDPOINT_EPILOGUE}\n"
+        f'    return {endpoint_name}Response(**shared.get("result", {{}}))\n'
+        "\n"
+    )
 
 
-def generate_fastapi_router(spec) -> str:
-    """Generate FastAPI router with endpoints (legacy parity)."""
+def _build_fastapi_router_lines(spec) -> List[str]:
+    """Build the lines of the generated FastAPI router source."""
+    spec_name = spec.name
     router_code = [
-        "from fastapi import APIRouter, HTTPException",
-        "from .schemas.models import *",
-        f"from .flow import {spec.name}Flow",
-        "from typing import Dict, Any",
-        "import logging",
-        "from datetime import datetime",
-        "",
-        "logger = logging.getLogger(__name__)",
-        "router = APIRouter()",
-        "",
+        _ROUTER_MODULE_IMPORTS,
+        f"from .flow import {spec_name}Flow",
+        _ROUTER_MODULE_SETUP,
     ]
+    router_code.extend(
+        _render_router_endpoint(spec_name, endpoint) for endpoint in spec.api_endpoints
+    )
 
-    for endpoint in spec.api_endpoints:
-        method = endpoint.get("method", "post").lower()
-        path = endpoint.get("path", f"/{endpoint['name'].lower()}")
-        endpoint_name = endpoint["name"]
-        default_desc = f"Execute {endpoint_name} workflow"
+    return router_code
 
-        router_code.extend(
-            [
-                f'@router.{method}("{path}", response_model={endpoint_name}Response)',
-                f"async def {endpoint_name.lower()}_endpoint(request: {endpoint_name}Request):",
-                '    """',
-                f"    {endpoint.get('description', default_desc)}",
-                '    """',
-                "    # TODO: Add authentication and authorization logic here",
-                "    # ",
-                "    # FRAMEWORK GUIDANCE: This TODO is intentional. The Agent OS + PocketFlow",
-                "    # framework provides templates and structure, but YOU implement the specific",
-                "    # business logic for your use case.",
-                "    #",
-                "    # Why? This ensures maximum flexibility and prevents vendor lock-in.",
-                "    # ",
-                "    # Next Steps:",
-                "    # 1. Review docs/design.md for your specific requirements",
-                "    # 2. Implement auth strategy (JWT, OAuth, API keys, etc.)",
-                "    # 3. See ~/.agent-os/standards/best-practices.md for patterns",
-                "    ",
-                "    # TODO: Add input validation and sanitization",
-                "    # ",
-                "    # FRAMEWORK GUIDANCE: This TODO is intentional. The Agent OS + PocketFlow",
-                "    # framework provides templates and structure, but YOU implement the specific",
-                "    # business logic for your use case.",
-                "    #",
-                "    # Why? This ensures maximum flexibility and prevents vendor lock-in.",
-                "    # ",
-                "    # Next Steps:",
-                "    # 1. Review docs/design.md for your specific requirements",
-                "    # 2. Add Pydantic validators or custom validation logic",
-                "    # 3. See ~/.agent-os/standards/best-practices.md for patterns",
-                "    ",
-                "    # Initialize SharedStore",
-                "    shared = {",
-                '        "request_data": request.dict(),',
-                '        "timestamp": datetime.utcnow().isoformat()',
-                "    }",
-                "",
-                "    # Execute workflow - let PocketFlow handle retries and errors",
-                f"    flow = {spec.name}Flow()",
-                "    await flow.run_async(shared)",
-                "",
-                "    # TODO: Customize error handling and response codes",
-                "    # ",
-                "    # FRAMEWORK GUIDANCE: This TODO is intentional. The Agent OS + PocketFlow",
-                "    # framework provides templates and structure, but YOU implement the specific",
-                "    # business logic for your use case.",
-                "    #",
-                "    # Why? This ensures maximum flexibility and prevents vendor lock-in.",
-                "    # ",
-                "    # Next Steps:",
-                "    # 1. Review docs/design.md for your specific requirements",
-                "    # 2. Follow FastAPI error handling patterns",
-                "    # 3. See ~/.agent-os/standards/best-practices.md for patterns",
-                "    # Check for flow-level errors",
-                '    if "error" in shared:',
-                "        raise HTTPException(",
-                "            status_code=422,",
-                '            detail=shared.get("error_message", "Workflow execution failed")',
-                "        )",
-                "",
-                "    # Return response",
-                f'    return {endpoint["name"]}Response(**shared.get("result", {{}}))',
-                "",
-                "",
-            ]
-        )
 
-    return "\n".join(router_code)
+def generate_fastapi_router(spec) -> str:
+    """Generate FastAPI router with endpoints (legacy parity)."""
+    return "\n".join(_build_fastapi_router_lines(spec))
 
 
 # -----------------------------
@@ -416,137 +614,194 @@ def generate_fastapi_router(spec) -> str:
 # -----------------------------
 
 
-def generate_pydantic_models(spec) -> str:
-    """Generate Pydantic models from shared store schema (legacy parity)."""
-    models: List[str] = [
-        "from pydantic import BaseModel, Field, validator",
-        "from typing import Dict, List, Optional, Any",
-        "from datetime import datetime",
-        "",
-        "",
-    ]
+def _build_pydantic_models_lines(spec) -> List[str]:
+    """Build the lines of the generated Pydantic models source."""
+    # Imports followed by the opening of the SharedStore model
+    models: List[str] = [_MODELS_MODULE_HEADER]
 
-    # SharedStore model
-    models.extend(
-        [
-            "class SharedStoreModel(BaseModel):",
-            '    """Pydantic model for SharedStore validation."""',
-            "",
-        ]
-    )
+    # Bound once: the field loops below call these for every model line
+    append = models.append
+    extend = models.extend
 
-    for key, value_type in spec.shared_store_schema.items():
-        models.append(f"    {key}: {value_type}")
+    # Each model's fields are joined into one block; an empty model adds none
+    schema = spec.shared_store_schema
+    if schema:
+        append(
+            "\n".join(
+                [f"    {key}: {value_type}" for key, value_type in schema.items()]
+            )
+        )
 
-    models.extend(["", ""])
+    extend(["", ""])
 
     # API models (universal architecture)
     for endpoint in spec.api_endpoints:
+        endpoint_name = endpoint["name"]
+
         # Request model
-        models.extend(
+        extend(
             [
-                f"class {endpoint['name']}Request(BaseModel):",
-                f'    """Request model for {endpoint["name"]} endpoint."""',
+                f"class {endpoint_name}Request(BaseModel):",
+                f'    """Request model for {endpoint_name} endpoint."""',
                 "",
             ]
         )
-        for field in endpoint.get("request_fields", []):
-            models.append(f"    {field['name']}: {field['type']}")
-        models.extend(["", ""])
+        fields = endpoint.get("request_fields", [])
+        if fields:
+            append("\n".join([f"    {fld['name']}: {fld['type']}" for fld in fields]))
+        extend(["", ""])
 
         # Response model
-        models.extend(
+        extend(
             [
-                f"class {endpoint['name']}Response(BaseModel):",
-                f'    """Response model for {endpoint["name"]} endpoint."""',
+                f"class {endpoint_name}Response(BaseModel):",
+                f'    """Response model for {endpoint_name} endpoint."""',
                 "",
             ]
         )
-        for field in endpoint.get("response_fields", []):
-            models.append(f"    {field['name']}: {field['type']}")
-        models.extend(["", ""])
+        fields = endpoint.get("response_fields", [])
+        if fields:
+            append("\n".join([f"    {fld['name']}: {fld['type']}" for fld in fields]))
+        extend(["", ""])
 
-    return "\n".join(models)
+    return models
 
 
-def _get_smart_node_defaults(
-    node: Dict[str, Any], is_async: bool = False
-) -> Dict[str, str]:
-    """Generate smart defaults based on node name and description (legacy parity)."""
-    name = str(node.get("name", "")).lower()
-    description = str(node.get("description", "")).lower()
-
-    # Common patterns for different node types
-    prep_examples = {
-        "retriever": 'return shared.get("query", "")',
-        "loader": 'return shared.get("file_path", "")',
-        "analyzer": 'return shared.get("content", "")',
-        "formatter": 'return shared.get("raw_data", "")',
-        "validator": 'return shared.get("input_data", "")',
-        "transformer": 'return shared.get("input_data", "")',
-        "llm": 'prompt = f"Process this: {shared.get("content", "")}"\n        return prompt',
-        "embedding": 'return shared.get("text", "")',
-        "search": 'return shared.get("query", "")',
-        "filter": 'return shared.get("items", [])',
-    }
-
-    # Async exec examples
-    exec_examples_async = {
-        "retriever": "search_results = await search_documents(prep_result)\n        return search_results",
-        "loader": 'async with aiofiles.open(prep_result, "r") as f:\n            content = await f.read()\n        return content',
-        "analyzer": "analysis = await analyze_content(prep_result)\n        return analysis",
-        "formatter": "formatted_data = await format_response_async(prep_result)\n        return formatted_data",
-        "validator": 'is_valid = await validate_input_async(prep_result)\n        return {"valid": is_valid, "data": prep_result}',
-        "transformer": "transformed = await transform_data_async(prep_result)\n        return transformed",
-        "llm": "response = await call_llm(prep_result)\n        return response",
-        "embedding": "embedding = await get_embedding(prep_result)\n        return embedding",
-        "search": "results = await search_vector_db(prep_result)\n        return results",
-        "filter": "filtered = await filter_async(prep_result)\n        return filtered",
-    }
+def generate_pydantic_models(spec) -> str:
+    """Generate Pydantic models from shared store schema (legacy parity)."""
+    return "\n".join(_build_pydantic_models_lines(spec))
 
-    # Sync exec examples
-    exec_examples_sync = {
-        "retriever": "search_results = search_documents(prep_result)\n        return search_results",
-        "loader": 'with open(prep_result, "r") as f:\n            content = f.read()\n        return content',
-        "analyzer": "analysis = analyze_content(prep_result)\n        return analysis",
-        "formatter": "formatted_data = format_response(prep_result)\n        return formatted_data",
-        "validator": 'is_valid = validate_input(prep_result)\n        return {"valid": is_valid, "data": prep_result}',
-        "transformer": "transformed = transform_data(prep_result)\n        return transformed",
-        "llm": "response = call_llm_sync(prep_result)\n        return response",
-        "embedding": "embedding = get_embedding_sync(prep_result)\n        return embedding",
-        "search": "results = search_vector_db_sync(prep_result)\n        return results",
-        "filter": "filtered = [item for item in prep_result if meets_criteria(item)]\n        return filtered",
-    }
 
-    exec_examples = exec_examples_async if is_async else exec_examples_sync
-
-    post_examples = {
-        "retriever": 'shared["retrieved_docs"] = exec_result\n        return "success"',
-        "loader": 'shared["loaded_content"] = exec_result\n        return "success"',
-        "analyzer": 'shared["analysis_result"] = exec_result\n        return "success"',
-        "formatter": 'shared["formatted_output"] = exec_result\n        return "success"',
-        "validator": 'shared["validation_result"] = exec_result\n        return "success" if exec_result.get("valid", True) else "validation_failed"',
-        "transformer": 'shared["transformed_data"] = exec_result\n        return "success"',
-        "llm": 'shared["llm_response"] = exec_result\n        return "success"',
-        "embedding": 'shared["embeddings"] = exec_result\n        return "success"',
-        "search": 'shared["search_results"] = exec_result\n        return "success"',
-        "filter": 'shared["filtered_data"] = exec_result\n        return "success"',
+_VALID_NODE_TYPES = frozenset(
+    {
+        "Node",
+        "AsyncNode",
+        "BatchNode",
+        "AsyncBatchNode",
+        "AsyncParallelBatchNode",
     }
+)
+_ASYNC_NODE_TYPES = frozenset({"AsyncNode", "AsyncBatchNode", "AsyncParallelBatchNode"})
+
+# node type -> (batch comment, is async, exec signature line), so one lookup
+# both validates a node's type and resolves everything derived from it
+_NODE_TYPE_TRAITS: Dict[str, Tuple[str, bool, str]] = {
+    node_type: (
+        "\n    # NOTE: BatchNode used for processing multiple items in parallel"
+        if node_type == "BatchNode"
+        else "",
+        node_type in _ASYNC_NODE_TYPES,
+        "    async def exec_async(self, prep_result: Any) -> str:"
+        if node_type in _ASYNC_NODE_TYPES
+        else "    def exec(self, prep_result: Any) -> str:",
+    )
+    for node_type in _VALID_NODE_TYPES
+}
+
+# Smart node defaults keyed by the pattern found in a node's name or
+# description; the first pattern in this order wins
+_PREP_EXAMPLES: Dict[str, str] = {
+    "retriever": 'return shared.get("query", "")',
+    "loader": 'return shared.get("file_path", "")',
+    "analyzer": 'return shared.get("content", "")',
+    "formatter": 'return shared.get("raw_data", "")',
+    "validator": 'return shared.get("input_data", "")',
+    "transformer": 'return shared.get("input_data", "")',
+    "llm": 'prompt = f"Process this: {shared.get("content", "")}"\n        return prompt',
+    "embedding": 'return shared.get("text", "")',
+    "search": 'return shared.get("query", "")',
+    "filter": 'return shared.get("items", [])',
+}
+
+_EXEC_EXAMPLES_ASYNC: Dict[str, str] = {
+    "retriever": "search_results = await search_documents(prep_result)\n        return search_results",
+    "loader": 'async with aiofiles.open(prep_result, "r") as f:\n            content = await f.read()\n        return content',
+    "analyzer": "analysis = await analyze_content(prep_result)\n        return analysis",
+    "formatter": "formatted_data = await format_response_async(prep_result)\n        return formatted_data",
+    "validator": 'is_valid = await validate_input_async(prep_result)\n        return {"valid": is_valid, "data": prep_result}',
+    "transformer": "transformed = await transform_data_async(prep_result)\n        return transformed",
+    "llm": "response = await call_llm(prep_result)\n        return response",
+    "embedding": "embedding = await get_embedding(prep_result)\n        return embedding",
+    "search": "results = await search_vector_db(prep_result)\n        return results",
+    "filter": "filtered = await filter_async(prep_result)\n        return filtered",
+}
+
+_EXEC_EXAMPLES_SYNC: Dict[str, str] = {
+    "retriever": "search_results = search_documents(prep_result)\n        return search_results",
+    "loader": 'with open(prep_result, "r") as f:\n            content = f.read()\n        return content',
+    "analyzer": "analysis = analyze_content(prep_result)\n        return analysis",
+    "formatter": "formatted_data = format_response(prep_result)\n        return formatted_data",
+    "validator": 'is_valid = validate_input(prep_result)\n        return {"valid": is_valid, "data": prep_result}',
+    "transformer": "transformed = transform_data(prep_result)\n        return transformed",
+    "llm": "response = call_llm_sync(prep_result)\n        return response",
+    "embedding": "embedding = get_embedding_sync(prep_result)\n        return embedding",
+    "search": "results = search_vector_db_sync(prep_result)\n        return results",
+    "filter": "filtered = [item for item in prep_result if meets_criteria(item)]\n        return filtered",
+}
+
+_POST_EXAMPLES: Dict[str, str] = {
+    "retriever": 'shared["retrieved_docs"] = exec_result\n        return "success"',
+    "loader": 'shared["loaded_content"] = exec_result\n        return "success"',
+    "analyzer": 'shared["analysis_result"] = exec_result\n        return "success"',
+    "formatter": 'shared["formatted_output"] = exec_result\n        return "success"',
+    "validator": 'shared["validation_result"] = exec_result\n        return "success" if exec_result.get("valid", True) else "validation_failed"',
+    "transformer": 'shared["transformed_data"] = exec_result\n        return "success"',
+    "llm": 'shared["llm_response"] = exec_result\n        return "success"',
+    "embedding": 'shared["embeddings"] = exec_result\n        return "success"',
+    "search": 'shared["search_results"] = exec_result\n        return "success"',
+    "filter": 'shared["filtered_data"] = exec_result\n        return "success"',
+}
+
+# (pattern, is_async) -> ready-made defaults. The entries are read-only views,
+# so they can be handed out per node without copying
+_NODE_DEFAULTS: Dict[Tuple[str, bool], Mapping[str, str]] = {
+    (pattern, is_async): MappingProxyType(
+        {
+            "prep": _PREP_EXAMPLES[pattern],
+            "exec": (_EXEC_EXAMPLES_ASYNC if is_async else _EXEC_EXAMPLES_SYNC)[
+                pattern
+            ],
+            "post": _POST_EXAMPLES[pattern],
+        }
+    )
+    for pattern in _PREP_EXAMPLES
+    for is_async in (False, True)
+}
 
-    for pattern in prep_examples.keys():
-        if pattern in name or pattern in description:
-            return {
-                "prep": prep_examples[pattern],
-                "exec": exec_examples[pattern],
-                "post": post_examples[pattern],
-            }
-
-    # Default fallback
-    return {
+_FALLBACK_NODE_DEFAULTS: Mapping[str, str] = MappingProxyType(
+    {
         "prep": 'return shared.get("input_data")',
         "exec": '# Implement your core logic here\n        return "success"',
         "post": 'shared["output_data"] = exec_result\n        return "success"',
     }
+)
+
+
+def _get_smart_node_defaults(
+    node: Dict[str, Any], is_async: bool = False
+) -> Mapping[str, str]:
+    """Generate smart defaults based on node name and description (legacy parity)."""
+    pattern = _match_node_pattern(
+        f"{node.get('name', '')}\0{node.get('description', '')}".lower()
+    )
+    if pattern is not None:
+        return _NODE_DEFAULTS[pattern, bool(is_async)]
+
+    # Default fallback
+    return _FALLBACK_NODE_DEFAULTS
+
+
+@lru_cache(maxsize=1024)
+def _match_node_pattern(text: str) -> Optional[str]:
+    """Return the first smart-default pattern found in lowercased node text."""
+    # Plain substring checks in pattern order. A single regex alternation would
+    # return the leftmost match rather than the highest-priority pattern
+    # ("filter llm output" must resolve to "llm"). Memoized because nodes are
+    # regenerated with the same names and descriptions
+    for pattern in _PREP_EXAMPLES:
+        if pattern in text:
+            return pattern
+    return None
 
 
 def _get_enhanced_todos_for_node(node: Dict[str, Any]) -> List[str]:
@@ -561,206 +816,111 @@ def _get_framework_reminders_for_node(node: Dict[str, Any]) -> List[str]:
     return list(node.get("framework_reminders", []))
 
 
-def generate_nodes(spec) -> str:
-    """Generate PocketFlow nodes from specification (legacy parity)."""
-    nodes_code: List[str] = [
-        "from pocketflow import Node, AsyncNode, BatchNode",
-        "from typing import Dict, Any, Optional",
-        "import logging",
-        "",
-        "logger = logging.getLogger(__name__)",
-        "",
-        "",
-    ]
+def _guidance_section(lines: List[Any]) -> List[str]:
+    """Indent class-level guidance lines and close the section with a blank line."""
+    if not lines:
+        return []
+    return [*[f"    {line}" for line in lines], ""]
 
-    for node in spec.nodes:
-        node_type = node.get("type", "Node")
-
-        valid_node_types = {
-            "Node",
-            "AsyncNode",
-            "BatchNode",
-            "AsyncBatchNode",
-            "AsyncParallelBatchNode",
-        }
-        if node_type not in valid_node_types:
-            raise ValueError(
-                f"Invalid node type '{node_type}' for node '{node['name']}'. "
-                f"Valid types are: {', '.join(sorted(valid_node_types))}"
-            )
-
-        batch_comment = ""
-        if node_type == "BatchNode":
-            batch_comment = (
-                "\n    # NOTE: BatchNode used for processing multiple items in parallel"
-            )
-
-        is_async_node = node_type in [
-            "AsyncNode",
-            "AsyncBatchNode",
-            "AsyncParallelBatchNode",
-        ]
-        exec_method = "async def exec_async" if is_async_node else "def exec"
-        exec_signature = f"    {exec_method}(self, prep_result: Any) -> str:"
-
-        smart_defaults = _get_smart_node_defaults(node, is_async_node)
-        enhanced_todos = _get_enhanced_todos_for_node(node)
-        orchestrator_guidance = _get_orchestrator_guidance_for_node(node)
-        framework_reminders = _get_framework_reminders_for_node(node)
-
-        nodes_code.extend(
-            [
-                f"class {node['name']}({node_type}):",
-                '    """',
-                f"    {node['description']}",
-                f'    """{batch_comment}',
-                "",
-            ]
-        )
 
-        # Framework reminders
-        if framework_reminders:
-            for reminder in framework_reminders:
-                nodes_code.append(f"    {reminder}")
-            nodes_code.append("")
+def _render_node_lines(node: Dict[str, Any]) -> Tuple[str, ...]:
+    """Render the source lines of one generated node class.
 
-        # Orchestrator guidance
-        if orchestrator_guidance:
-            for guidance in orchestrator_guidance:
-                nodes_code.append(f"    {guidance}")
-            nodes_code.append("")
+    Module-level and independent of the rest of the spec, so nodes can be
+    rendered in any order or by any worker.
+    """
+    node_type = node.get("type", "Node")
 
-        nodes_code.extend(
-            [
-                "    def prep(self, shared: Dict[str, Any]) -> Any:",
-                '        """',
-                "        Data preparation and validation.",
-                "        ",
-                "        BEST PRACTICE: Only read from shared store here.",
-                "        DO NOT: Perform computation or external calls.",
-                "        DO NOT: Access databases, APIs, or call LLMs.",
-                "        ",
-                "        This method should be fast, synchronous, and focused on",
-                "        extracting the exact data needed for exec().",
-                '        """',
-                f'        logger.info(f"Preparing data for {node["name"]}")',
-                "",
-                "        # Framework guidance: Read only what exec() needs from shared store",
-            ]
-        )
-
-        # Enhanced TODOs for prep with framework guidance
-        base_prep_todos = [
-            "# TODO: Extract the exact data exec() needs from shared store",
-            "# TODO: Consider input validation if needed (but keep it lightweight)",
-        ]
-        framework_guidance = [
-            "# ",
-            "# FRAMEWORK GUIDANCE: These TODOs are intentional. The Agent OS + PocketFlow",
-            "# framework provides templates and structure, but YOU implement the specific",
-            "# business logic for your use case.",
-            "#",
-            "# Why? This ensures maximum flexibility and prevents vendor lock-in.",
-            "# ",
-            "# Next Steps:",
-            "# 1. Review docs/design.md for your specific requirements",
-            "# 2. Follow PocketFlow node lifecycle: prep() → exec() → post()",
-            "# 3. See ~/.agent-os/standards/best-practices.md for patterns",
-        ]
-
-        # Always include framework guidance, with optional enhanced todos first
-        prep_todos = (
-            enhanced_todos[:2] if enhanced_todos else base_prep_todos
-        ) + framework_guidance
-        for todo in prep_todos:
-            nodes_code.append(f"        {todo}")
-
-        nodes_code.extend(
-            [
-                f"        {smart_defaults['prep']}",
-                "",
-                exec_signature,
-                '        """',
-                "        Core processing logic.",
-                "        ",
-                "        BEST PRACTICE: Use only prep_result as input.",
-                "        DO NOT: Access shared store directly.",
-                "        DO NOT: Use try/except for flow control.",
-                "        ",
-                "        Let exceptions bubble up for PocketFlow retry handling.",
-                "        Use return values and post() for business logic branching.",
-                '        """',
-                f'        logger.info(f"Executing {node["name"]}")',
-                "",
-                "        # Framework guidance: Process prep_result, avoid shared store access",
-            ]
+    traits = _NODE_TYPE_TRAITS.get(node_type)
+    if traits is None:
+        raise ValueError(
+            f"Invalid node type '{node_type}' for node '{node['name']}'. "
+            f"Valid types are: {', '.join(sorted(_VALID_NODE_TYPES))}"
         )
+    batch_comment, is_async_node, exec_signature = traits
+
+    smart_defaults = _get_smart_node_defaults(node, is_async_node)
+    enhanced_todos = _get_enhanced_todos_for_node(node)
+    orchestrator_guidance = _get_orchestrator_guidance_for_node(node)
+    framework_reminders = _get_framework_reminders_for_node(node)
+
+    # Enhanced TODOs per method, each followed by the framework guidance. Each
+    # method's TODOs are indented and joined into one block in a single pass
+    todo_count = len(enhanced_todos)
+    prep_todos = (
+        _NODE_TODO_INDENT + _NODE_TODO_SEPARATOR.join(map(str, enhanced_todos[:2]))
+        if todo_count
+        else _NODE_BASE_PREP_TODO_BLOCK
+    )
+    exec_todos = (
+        _NODE_TODO_INDENT + _NODE_TODO_SEPARATOR.join(map(str, enhanced_todos[2:4]))
+        if todo_count > 2
+        else _NODE_BASE_EXEC_TODO_BLOCK
+    )
+    post_todos = (
+        _NODE_TODO_INDENT + _NODE_TODO_SEPARATOR.join(map(str, enhanced_todos[4:]))
+        if todo_count > 4
+        else _NODE_BASE_POST_TODO_BLOCK
+    )
 
-        # Enhanced TODOs for exec with framework guidance
-        base_exec_todos = [
-            "# TODO: Implement the core processing logic using only prep_result",
-            "# TODO: Return the processed result (avoid side effects here)",
-        ]
-        # Reuse framework guidance (same for all sections)
+    # The whole class as one tuple; static blocks are shared constants, so
+    # nothing but the per-node text is copied before the final join
+    return (
+        f"class {node['name']}({node_type}):",
+        '    """',
+        f"    {node['description']}",
+        f'    """{batch_comment}',
+        "",
+        *_guidance_section(framework_reminders),
+        *_guidance_section(orchestrator_guidance),
+        _NODE_PREP_DOC,
+        f'        logger.info(f"Preparing data for {node["name"]}")',
+        _NODE_PREP_GUIDANCE_HEADER,
+        prep_todos,
+        _NODE_FRAMEWORK_GUIDANCE,
+        f"        {smart_defaults['prep']}",
+        "",
+        exec_signature,
+        _NODE_EXEC_DOC,
+        f'        logger.info(f"Executing {node["name"]}")',
+        _NODE_EXEC_GUIDANCE_HEADER,
+        exec_todos,
+        _NODE_FRAMEWORK_GUIDANCE,
+        f"        {smart_defaults['exec']}",
+        "",
+        _NODE_POST_DOC,
+        f'        logger.info(f"Post-processing for {node["name"]}")',
+        _NODE_POST_GUIDANCE_HEADER,
+        post_todos,
+        _NODE_FRAMEWORK_GUIDANCE,
+        f"        {smart_defaults['post']}",
+        _NODE_CLASS_END,
+    )
 
-        # Always include framework guidance, with optional enhanced todos first
-        exec_todos = (
-            enhanced_todos[2:4] if len(enhanced_todos) > 2 else base_exec_todos
-        ) + framework_guidance
-        for todo in exec_todos:
-            nodes_code.append(f"        {todo}")
 
-        nodes_code.extend(
-            [
-                f"        {smart_defaults['exec']}",
-                "",
-                "    def post(self, shared: Dict[str, Any], prep_result: Any, exec_result: Any) -> Optional[str]:",
-                '        """',
-                "        Post-processing and result storage.",
-                "        ",
-                "        BEST PRACTICE: Store results in shared store and return flow signals.",
-                "        DO NOT: Perform heavy computation here.",
-                "        DO NOT: Call external APIs or services.",
-                "        ",
-                '        Use return values to signal flow branching (e.g., "success", "retry", "error").',
-                "        Keep this method fast and focused on data storage and routing.",
-                '        """',
-                f'        logger.info(f"Post-processing for {node["name"]}")',
-                "",
-                "        # Framework guidance: Store exec_result in shared store, return flow signal",
-            ]
-        )
+def _build_nodes_lines(spec) -> List[str]:
+    """Build the lines of the generated PocketFlow nodes source."""
+    nodes_code: List[str] = [_NODES_MODULE_HEADER]
 
-        # Enhanced TODOs for post with framework guidance
-        base_post_todos = [
-            "# TODO: Store exec_result in shared store with appropriate key",
-            "# TODO: Return flow signal for branching ('success', 'error', specific state)",
-        ]
-        # Reuse framework guidance (same for all sections)
+    extend = nodes_code.extend
+    for node in spec.nodes:
+        extend(_render_node_lines(node))
 
-        # Always include framework guidance, with optional enhanced todos first
-        post_todos = (
-            enhanced_todos[4:] if len(enhanced_todos) > 4 else base_post_todos
-        ) + framework_guidance
-        for todo in post_todos:
-            nodes_code.append(f"        {todo}")
+    return nodes_code
 
-        nodes_code.extend(
-            [
-                f"        {smart_defaults['post']}",
-                "",
-                "",
-            ]
-        )
 
-    return "\n".join(nodes_code)
+def generate_nodes(spec) -> str:
+    """Generate PocketFlow nodes from specification (legacy parity)."""
+    return "\n".join(_build_nodes_lines(spec))
 
 
-def generate_flow(spec) -> str:
-    """Generate PocketFlow flow assembly (legacy parity)."""
+def _build_flow_lines(spec) -> List[str]:
+    """Build the lines of the generated PocketFlow flow source."""
+    # Node names are read once and shared by the import line, entries and edges
+    node_names = [node["name"] for node in spec.nodes]
     flow_code: List[str] = [
         "from pocketflow import Flow",
-        "from .nodes import " + ", ".join(node["name"] for node in spec.nodes),
+        "from .nodes import " + ", ".join(node_names),
         "import logging",
         "",
         "logger = logging.getLogger(__name__)",
@@ -774,70 +934,36 @@ def generate_flow(spec) -> str:
             '    """',
             f"    {spec.description}",
             '    """',
-            "",
-            "    def __init__(self):",
-            "        # TODO: Customize node instances and their configurations",
-            "        # ",
-            "        # FRAMEWORK GUIDANCE: This TODO is intentional. The Agent OS + PocketFlow",
-            "        # framework provides templates and structure, but YOU implement the specific",
-            "        # business logic for your use case.",
-            "        #",
-            "        # Why? This ensures maximum flexibility and prevents vendor lock-in.",
-            "        # ",
-            "        # Next Steps:",
-            "        # 1. Review docs/design.md for your specific requirements",
-            "        # 2. Configure node parameters based on your domain needs",
-            "        # 3. See ~/.agent-os/standards/best-practices.md for patterns",
-            "        nodes = {",
+            _FLOW_NODES_PREAMBLE,
         ]
     )
 
-    for node in spec.nodes:
-        flow_code.append(f'            "{node["name"].lower()}": {node["name"]}(),')
+    # Each node name is lowercased once and reused for its entry and edges
+    node_keys = [name.lower() for name in node_names]
 
-    flow_code.extend(
-        [
-            "        }",
-            "",
-            "        # TODO: Customize workflow connections and error handling",
-            "        # ",
-            "        # FRAMEWORK GUIDANCE: This TODO is intentional. The Agent OS + PocketFlow",
-            "        # framework provides templates and structure, but YOU implement the specific",
-            "        # business logic for your use case.",
-            "        #",
-            "        # Why? This ensures maximum flexibility and prevents vendor lock-in.",
-            "        # ",
-            "        # Next Steps:",
-            "        # 1. Review docs/design.md for your specific requirements",
-            "        # 2. Follow PocketFlow flow lifecycle: init() → run_async() → cleanup()",
-            "        # 3. See ~/.agent-os/standards/best-practices.md for patterns",
-            "        edges = {",
-        ]
-    )
+    for node_name, node_key in zip(node_names, node_keys):
+        flow_code.append(f'            "{node_key}": {node_name}(),')
 
-    for i, node in enumerate(spec.nodes):
-        node_name = node["name"].lower()
-        if i < len(spec.nodes) - 1:
-            next_node = spec.nodes[i + 1]["name"].lower()
-            flow_code.append(
-                f'            "{node_name}": {{"success": "{next_node}", "error": "error_handler"}},'
-            )
-        else:
-            flow_code.append(
-                f'            "{node_name}": {{"success": None, "error": "error_handler"}},'
-            )
+    flow_code.append(_FLOW_EDGES_PREAMBLE)
 
-    flow_code.extend(
-        [
-            "        }",
-            "",
-            "        super().__init__(nodes=nodes, edges=edges)",
-            "",
-            "",
-        ]
-    )
+    # Each node succeeds into the next one; the last node ends the flow
+    for node_name, next_node in pairwise(node_keys):
+        flow_code.append(
+            f'            "{node_name}": {{"success": "{next_node}", "error": "error_handler"}},'
+        )
+    if node_keys:
+        flow_code.append(
+            f'            "{node_keys[-1]}": {{"success": None, "error": "error_handler"}},'
+        )
+
+    flow_code.append(_FLOW_EPILOGUE)
+
+    return flow_code
 
-    return "\n".join(flow_code)
+
+def generate_flow(spec) -> str:
+    """Generate PocketFlow flow assembly (legacy parity)."""
+    return "\n".join(_build_flow_lines(spec))
 
 
 def generate_install_checker_reference() -> str:
@@ -885,6 +1011,7 @@ def generate_init_file(
 ) -> str:
     """Generate appropriate __init__.py file content (legacy parity)."""
     if is_root:
+        node_names = [node["name"] for node in spec.nodes]
         return f'''"""
 {spec.name} - PocketFlow Workflow
 
@@ -894,12 +1021,12 @@ Generated by Agent OS + PocketFlow Generator
 """
 
 from .flow import {spec.name}Flow
-from .nodes import {", ".join(node["name"] for node in spec.nodes)}
+from .nodes import {", ".join(node_names)}
 
 __version__ = "0.1.0"
 __all__ = [
     "{spec.name}Flow",
-    {", ".join(f'"{node["name"]}"' for node in spec.nodes)}
+    {", ".join(f'"{name}"' for name in node_names)}
 ]
 '''
     if is_test:
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Any, Dict
+from typing import Any, Dict, Mapping
 
 
 @dataclass
@@ -13,5 +13,5 @@ class GenerationContext:
     """
 
     templates: Dict[str, str]
-    extensions: Dict[str, Any]
+    extensions: Mapping[str, Any]
     enable_hybrid_promotion: bool = False
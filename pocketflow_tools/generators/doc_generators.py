@@ -1,42 +1,62 @@
 from __future__ import annotations
 
-from datetime import datetime
+from datetime import date
 from typing import Any, Dict, List
 
+# Code point of the mermaid id given to the first node ("A" and "B" are fixed)
+_FIRST_NODE_ID_ORD = ord("C")
+
 
 def _generate_basic_mermaid(spec) -> str:
     """Generate a basic Mermaid diagram as fallback (legacy parity)."""
-    lines: List[str] = [
-        "```mermaid",
-        "graph TD",
-        "    A[Start] --> B[Input Validation]",
+    nodes = spec.nodes
+    # Nodes get consecutive ids from "C"; each is entered from the one before it
+    node_ids = [chr(_FIRST_NODE_ID_ORD + i) for i in range(len(nodes))]
+    edges = [
+        f"    {prev_id} --> {node_id}[{node['name']}]"
+        for prev_id, node_id, node in zip(["B", *node_ids], node_ids, nodes)
     ]
-    prev_node = "B"
-    for i, node in enumerate(spec.nodes):
-        node_id = chr(ord("C") + i)
-        lines.append(f"    {prev_node} --> {node_id}[{node['name']}]")
-        prev_node = node_id
-    lines.append(f"    {prev_node} --> Z[End]")
-    lines.append("```")
-    return "\n".join(lines)
+    last_id = node_ids[-1] if node_ids else "B"
+    return "\n".join(
+        [
+            "```mermaid",
+            "graph TD",
+            "    A[Start] --> B[Input Validation]",
+            *edges,
+            f"    {last_id} --> Z[End]",
+            "```",
+        ]
+    )
 
 
 def _format_customizations_for_doc(customizations: Dict[str, Any]) -> str:
     """Format customizations for documentation (legacy parity)."""
     if not customizations:
         return "- No specific customizations applied"
-    formatted: List[str] = []
-    for key, value in customizations.items():
-        formatted.append(f"- **{key.replace('_', ' ').title()}:** {value}")
-    return "\n".join(formatted)
+    return "\n".join(
+        [
+            f"- **{key.replace('_', ' ').title()}:** {value}"
+            for key, value in customizations.items()
+        ]
+    )
+
+
+def _format_utility_params(utility: Dict[str, Any]) -> str:
+    """Format a utility's parameters as a comma-separated ``name: type`` list."""
+    return ", ".join(
+        [f"{p['name']}: {p['type']}" for p in utility.get("parameters", [])]
+    )
 
 
 def generate_design_doc(spec) -> str:
     """Generate design document from template (legacy base implementation)."""
+    nodes = spec.nodes
+    utilities = spec.utilities
+    pattern = spec.pattern
     design_doc = f"""# Design Document
 
 > Spec: {spec.name}
-> Created: {datetime.now().isoformat()[:10]}
+> Created: {date.today().isoformat()}
 > Status: Design Phase
 > Framework: PocketFlow
 
@@ -48,13 +68,13 @@ def generate_design_doc(spec) -> str:
 {spec.description}
 
 ### Success Criteria
-- Successful implementation of {spec.pattern} pattern
+- Successful implementation of {pattern} pattern
 - All nodes execute correctly in sequence
 - Proper error handling and validation
 - Complete test coverage
 
 ### Design Pattern Classification
-**Primary Pattern:** {spec.pattern}
+**Primary Pattern:** {pattern}
 **Secondary Patterns:** FastAPI Integration (Universal)
 
 ### Input/Output Specification
@@ -68,69 +88,89 @@ def generate_design_doc(spec) -> str:
 {_generate_basic_mermaid(spec)}
 """
 
+    # Every section is collected as a fragment and joined once at the end
+    parts: List[str] = [design_doc]
+    append = parts.append
+
+    # Each node's name and description are read once for both node sections
+    node_rows = [
+        (i, node, node["name"], node["description"]) for i, node in enumerate(nodes, 1)
+    ]
+
     # Node sequence
-    design_doc += "\n### Node Sequence\n"
-    for i, node in enumerate(spec.nodes, 1):
-        design_doc += f"{i}. **{node['name']}** - {node['description']}\n"
+    append("\n### Node Sequence\n")
+    for i, _node, name, description in node_rows:
+        append(f"{i}. **{name}** - {description}\n")
 
     # Utilities
-    design_doc += "\n## Utilities\n\n"
-    design_doc += 'Following PocketFlow\'s "implement your own" philosophy, specify all utility functions needed.\n\n'
-    design_doc += "### Required Utility Functions\n\n"
-    for utility in spec.utilities:
-        design_doc += f"#### {utility['name']}\n"
-        design_doc += f"- **Purpose:** {utility['description']}\n"
-        params_str = ", ".join(
-            [f"{p['name']}: {p['type']}" for p in utility.get("parameters", [])]
+    append("\n## Utilities\n\n")
+    append(
+        'Following PocketFlow\'s "implement your own" philosophy, specify all utility functions needed.\n\n'
+    )
+    append("### Required Utility Functions\n\n")
+    for utility in utilities:
+        append(
+            f"#### {utility['name']}\n"
+            f"- **Purpose:** {utility['description']}\n"
+            f"- **Input:** {_format_utility_params(utility)}\n"
+            f"- **Output:** {utility.get('return_type', 'Any')}\n\n"
         )
-        design_doc += f"- **Input:** {params_str}\n"
-        design_doc += f"- **Output:** {utility.get('return_type', 'Any')}\n\n"
 
     # Shared store schema
-    design_doc += "\n## Data Design\n\n"
-    design_doc += "### SharedStore Schema\n"
-    design_doc += "Following PocketFlow's shared store pattern, all data flows through a common dictionary.\n\n"
-    design_doc += "```python\n"
-    design_doc += "SharedStore = {\n"
+    append("\n## Data Design\n\n")
+    append("### SharedStore Schema\n")
+    append(
+        "Following PocketFlow's shared store pattern, all data flows through a common dictionary.\n\n"
+    )
+    append("```python\n")
+    append("SharedStore = {\n")
     for key, value_type in spec.shared_store_schema.items():
-        design_doc += f'    "{key}": {value_type},\n'
-    design_doc += "}\n```\n"
+        append(f'    "{key}": {value_type},\n')
+    append("}\n```\n")
 
     # Node design
-    design_doc += "\n## Node Design\n\n"
-    design_doc += "Following PocketFlow's node-based architecture, each processing step is implemented as a discrete node.\n\n"
-    for i, node in enumerate(spec.nodes, 1):
-        design_doc += f"### {i}. {node['name']}\n"
-        design_doc += f"**Purpose:** {node['description']}\n\n"
-        inputs_str = ", ".join(node.get("inputs", []) or []) or "SharedStore"
-        outputs_str = ", ".join(node.get("outputs", []) or []) or "Updates SharedStore"
-        design_doc += f"**Inputs:** {inputs_str}\n"
-        design_doc += f"**Outputs:** {outputs_str}\n\n"
+    append("\n## Node Design\n\n")
+    append(
+        "Following PocketFlow's node-based architecture, each processing step is implemented as a discrete node.\n\n"
+    )
+    for i, node, name, description in node_rows:
+        inputs_str = ", ".join(node.get("inputs") or ()) or "SharedStore"
+        outputs_str = ", ".join(node.get("outputs") or ()) or "Updates SharedStore"
+        append(
+            f"### {i}. {name}\n**Purpose:** {description}\n\n"
+            f"**Inputs:** {inputs_str}\n**Outputs:** {outputs_str}\n\n"
+        )
 
     # Implementation notes
-    design_doc += "\n## Implementation Notes\n\n"
-    design_doc += f"- Pattern: {spec.pattern}\n"
-    design_doc += f"- Nodes: {len(spec.nodes)}\n"
-    design_doc += f"- Utilities: {len(spec.utilities)}\n"
-    design_doc += "- FastAPI Integration: Enabled (Universal)\n"
-    design_doc += "\nThis design document was generated automatically. Please review and complete with specific implementation details."
+    append("\n## Implementation Notes\n\n")
+    append(f"- Pattern: {pattern}\n")
+    append(f"- Nodes: {len(nodes)}\n")
+    append(f"- Utilities: {len(utilities)}\n")
+    append("- FastAPI Integration: Enabled (Universal)\n")
+    append(
+        "\nThis design document was generated automatically. Please review and complete with specific implementation details."
+    )
 
-    return design_doc
+    return "".join(parts)
 
 
 def generate_tasks(spec) -> str:
     """Generate tasks.md content (legacy parity)."""
-    current_date = datetime.now().isoformat()[:10]
+    current_date = date.today().isoformat()
+    name = spec.name
+    pattern = spec.pattern
+    utilities = spec.utilities
 
-    tasks = f"""# Implementation Tasks for {spec.name}
+    parts: List[str] = [
+        f"""# Implementation Tasks for {name}
 
-This document outlines the tasks required to complete the implementation of the {spec.name} workflow.
+This document outlines the tasks required to complete the implementation of the {name} workflow.
 
 ## Overview
 
 ### Project Summary
-- **Workflow Name:** {spec.name}
-- **Pattern:** {spec.pattern}
+- **Workflow Name:** {name}
+- **Pattern:** {pattern}
 - **Description:** {spec.description}
 - **FastAPI Integration:** Enabled (Universal)
 - **Generated On:** {current_date}
@@ -150,11 +190,15 @@ This document outlines the tasks required to complete the implementation of the
 - [ ] 2.1 Write tests for utility functions (with mocked external dependencies)
 - [x] 2.2 Implement utility functions in `utils/` directory ✓ (Generated templates)
 """
+    ]
+    append = parts.append
 
-    for utility in spec.utilities:
-        tasks += f"\n- [ ] 2.2.{utility['name']}: Complete implementation of `utils/{utility['name']}.py`"
+    for utility in utilities:
+        append(
+            f"\n- [ ] 2.2.{utility['name']}: Complete implementation of `utils/{utility['name']}.py`"
+        )
 
-    tasks += """
+    append("""
 - [ ] 2.3 Add proper type hints and docstrings for all utilities
 - [ ] 2.4 Implement LLM integration utilities (if applicable)
 - [ ] 2.5 Add error handling without try/catch (fail fast approach)
@@ -173,14 +217,12 @@ This document outlines the tasks required to complete the implementation of the
 ### Phase 4: PocketFlow Nodes (LLM/AI Components)
 - [ ] 4.1 Write tests for individual node lifecycle methods
 - [x] 4.2 Implement nodes in `nodes.py` following design.md specifications ✓ (Generated templates)
-"""
+""")
 
     for node in spec.nodes:
-        tasks += (
-            f"\n- [ ] 4.2.{node['name']}: Complete implementation of {node['name']}"
-        )
+        append(f"\n- [ ] 4.2.{node['name']}: Complete implementation of {node['name']}")
 
-    tasks += """
+    append("""
 - [ ] 4.3 Create prep() methods for data access and validation
 - [ ] 4.4 Implement exec() methods with utility function calls
 - [ ] 4.5 Add post() methods for result storage and action determination
@@ -232,12 +274,12 @@ The following files have been generated and need completion:
 - `flow.py` - Flow assembly (review connections)
 
 ### Utility Files ✓
-"""
+""")
 
-    for utility in spec.utilities:
-        tasks += f"\n- `utils/{utility['name']}.py` - {utility['description']}"
+    for utility in utilities:
+        append(f"\n- `utils/{utility['name']}.py` - {utility['description']}")
 
-    tasks += """
+    append(f"""
 
 ### FastAPI Files ✓
 - `main.py` - FastAPI application
@@ -256,8 +298,8 @@ The following files have been generated and need completion:
 5. Deploy and validate in staging environment
 
 Generated on: {current_date}
-Workflow Pattern: {spec.pattern}
+Workflow Pattern: {pattern}
 FastAPI Integration: Enabled (Universal)
-"""
+""")
 
-    return tasks
+    return "".join(parts)
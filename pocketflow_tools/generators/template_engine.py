@@ -1,13 +1,66 @@
 from __future__ import annotations
 
 import logging
+import os
 import re
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Callable, Dict, Iterator, List, Mapping, Tuple
 
 
 logger = logging.getLogger(__name__)
 
+# Extraction patterns for extension documents, compiled once at import
+_CODE_BLOCK_RE = re.compile(r"```(?:python|bash)\n(.*?)```", re.DOTALL)
+_TODO_LINE_RE = re.compile(r"#.*TODO:.*")
+_ORCHESTRATOR_RE = re.compile(r"claude-code.*orchestrator[^\n]*")
+
+# Extension document locations, in lookup order, and the files read from them
+_EXTENSION_DIRS = (
+    Path("instructions/extensions"),
+    Path("../instructions/extensions"),
+)
+_EXTENSION_FILES = {
+    "design_enforcement": "design-first-enforcement.md",
+    "llm_workflow": "llm-workflow-extension.md",
+    "pocketflow_integration": "pocketflow-integration.md",
+}
+
+
+class _LazyExtensions(Mapping[str, Any]):
+    """Read-only mapping of extension key -> parsed guidance.
+
+    Holds the raw extension documents and parses each one on first access,
+    so extensions a generation run never reads are never parsed. Instances
+    are shared by every generator through the load cache, so each lookup
+    returns a fresh copy of the parsed guidance: a caller editing its result
+    cannot change what other generators see.
+    """
+
+    def __init__(
+        self, contents: Dict[str, str], parse: Callable[[str], Dict[str, Any]]
+    ) -> None:
+        self._contents = contents
+        self._parse = parse
+        self._parsed: Dict[str, Dict[str, Any]] = {}
+
+    def __getitem__(self, key: str) -> Dict[str, Any]:
+        try:
+            parsed = self._parsed[key]
+        except KeyError:
+            parsed = self._parsed[key] = self._parse(self._contents[key])
+        # Every parsed value is a list of strings, so copying the lists
+        # isolates the caller completely
+        return {name: list(values) for name, values in parsed.items()}
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._contents)
+
+    def __len__(self) -> int:
+        return len(self._contents)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({list(self._contents)!r})"
+
 
 class TemplateEngine:
     """Load templates and enhanced extensions for generation.
@@ -18,24 +71,65 @@ class TemplateEngine:
     def __init__(self, templates_path: Path) -> None:
         self.templates_path = templates_path
 
+    def _template_files(self) -> List[Path]:
+        """List the *.md files directly inside the templates directory.
+
+        Filters a plain directory scan by name, which is cheaper than glob
+        for a single fixed suffix. A missing directory has no templates.
+        """
+        try:
+            with os.scandir(self.templates_path) as entries:
+                return [
+                    self.templates_path / entry.name
+                    for entry in entries
+                    if entry.name.endswith(".md")
+                ]
+        except FileNotFoundError:
+            return []
+
     def load_templates(self) -> Dict[str, str]:
         """Load all template files from the templates directory (*.md)."""
-        templates: Dict[str, str] = {}
-        for template_file in self.templates_path.glob("*.md"):
-            templates[template_file.stem] = template_file.read_text()
-        return templates
+        return {
+            template_file.stem: template_file.read_text()
+            for template_file in self._template_files()
+        }
 
-    def load_enhanced_extensions(self) -> Dict[str, Any]:
+    def source_signature(self) -> Tuple[Tuple[str, int, int], ...]:
+        """Describe the on-disk state of everything the loaders read.
+
+        One (absolute path, mtime_ns, size) entry per template, extension
+        directory and extension file; missing paths are recorded as (-1, -1).
+        Equal signatures mean the loaders would return the same results.
+        """
+        paths = self._template_files()
+        for extensions_path in _EXTENSION_DIRS:
+            paths.append(extensions_path)
+            paths.extend(
+                extensions_path / filename for filename in _EXTENSION_FILES.values()
+            )
+
+        signature = []
+        for path in paths:
+            try:
+                stat = path.stat()
+            except OSError:
+                signature.append((str(path.absolute()), -1, -1))
+            else:
+                signature.append((str(path.absolute()), stat.st_mtime_ns, stat.st_size))
+        return tuple(signature)
+
+    def load_enhanced_extensions(self) -> Mapping[str, Any]:
         """Load enhanced extensions for improved template generation.
 
         Follows the same fallback path logic as the legacy implementation:
         prefer ./instructions/extensions, then ../instructions/extensions.
+        Extension files are read here but parsed on first access.
         """
-        extensions: Dict[str, Any] = {}
+        contents: Dict[str, str] = {}
 
-        extensions_path = Path("instructions/extensions")
+        extensions_path = _EXTENSION_DIRS[0]
         if not extensions_path.exists():
-            extensions_path = Path("../instructions/extensions")
+            extensions_path = _EXTENSION_DIRS[1]
             if not extensions_path.exists():
                 logging.warning(
                     "Enhanced extensions not found, using basic template generation"
@@ -43,24 +137,20 @@ class TemplateEngine:
                 return {}
 
         try:
-            extension_files = {
-                "design_enforcement": "design-first-enforcement.md",
-                "llm_workflow": "llm-workflow-extension.md",
-                "pocketflow_integration": "pocketflow-integration.md",
-            }
-
-            for key, filename in extension_files.items():
-                ext_file = extensions_path / filename
-                if ext_file.exists():
-                    content = ext_file.read_text()
-                    extensions[key] = self._parse_extension_templates(content)
-                else:
+            for key, filename in _EXTENSION_FILES.items():
+                # Read directly instead of stat-ing first; a missing file is
+                # the uncommon case
+                try:
+                    content = (extensions_path / filename).read_text()
+                except FileNotFoundError:
                     logging.warning(f"Extension not found: {filename}")
+                    continue
+                contents[key] = content
         except Exception as e:  # pragma: no cover - defensive parity
             logging.warning(f"Failed to load enhanced extensions: {e}")
             return {}
 
-        return extensions
+        return _LazyExtensions(contents, self._parse_extension_templates)
 
     def _parse_extension_templates(self, content: str) -> Dict[str, Any]:
         """Parse extension content to extract template guidance.
@@ -73,13 +163,13 @@ class TemplateEngine:
             "orchestrator_integration": [],
         }
 
-        code_blocks = re.findall(r"```(?:python|bash)\n(.*?)```", content, re.DOTALL)
+        code_blocks = _CODE_BLOCK_RE.findall(content)
         templates["code_templates"] = code_blocks
 
-        todo_lines = re.findall(r"#.*TODO:.*", content)
+        todo_lines = _TODO_LINE_RE.findall(content)
         templates["todo_guidance"] = todo_lines
 
-        orchestrator_matches = re.findall(r"claude-code.*orchestrator[^\n]*", content)
+        orchestrator_matches = _ORCHESTRATOR_RE.findall(content)
         templates["orchestrator_integration"] = orchestrator_matches
 
         return templates
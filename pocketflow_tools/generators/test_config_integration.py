@@ -3,11 +3,14 @@
 Integration test for config_generators with dependency orchestrator
 """
 
+import re
 import sys
 from pathlib import Path
 
-# Add parent directories to path for imports
-sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+# Add parent directories to path for imports (once, if not already there)
+_REPO_ROOT = str(Path(__file__).resolve().parent.parent.parent)
+if _REPO_ROOT not in sys.path:
+    sys.path.insert(0, _REPO_ROOT)
 
 from pocketflow_tools.spec import WorkflowSpec
 from pocketflow_tools.generators.config_generators import (
@@ -29,6 +32,15 @@ def create_test_spec(pattern: str) -> WorkflowSpec:
     )
 
 
+def requirement_names(requirements: str) -> set:
+    """Return the package names listed in a requirements file."""
+    return {
+        re.split(r"[\s\[<>=!~;]", line, maxsplit=1)[0].lower()
+        for line in requirements.splitlines()
+        if line.strip() and not line.lstrip().startswith("#")
+    }
+
+
 def test_generate_dependency_files_with_patterns():
     """Test that generate_dependency_files works with all patterns."""
     print("=== Testing generate_dependency_files Integration ===\n")
@@ -52,17 +64,17 @@ def test_generate_dependency_files_with_patterns():
             ".python-version",
         ]
 
-        for file_name in expected_files:
-            assert file_name in files, f"Missing {file_name} for {pattern}"
-            assert len(files[file_name]) > 0, f"Empty {file_name} for {pattern}"
+        missing = set(expected_files) - files.keys()
+        assert not missing, f"Missing {sorted(missing)} for {pattern}"
+        empty = [file_name for file_name in expected_files if not files[file_name]]
+        assert not empty, f"Empty {empty} for {pattern}"
 
-        # Verify pattern-specific dependencies are included
-        requirements = files["requirements.txt"]
+        # Verify pattern-specific dependencies are included, by package name
+        requirements = requirement_names(files["requirements.txt"])
 
         # All patterns should have base dependencies
-        assert "pocketflow" in requirements, f"{pattern} should have pocketflow"
-        assert "pydantic" in requirements, f"{pattern} should have pydantic"
-        assert "fastapi" in requirements, f"{pattern} should have fastapi"
+        missing = {"pocketflow", "pydantic", "fastapi"} - requirements
+        assert not missing, f"{pattern} should have {sorted(missing)}"
 
         # Check pattern-specific dependencies
         if pattern == "RAG":
@@ -72,7 +84,7 @@ def test_generate_dependency_files_with_patterns():
             assert "openai" in requirements, "AGENT should have openai"
             print(f"  ✓ {pattern}: openai included")
         elif pattern == "TOOL":
-            has_http = "requests" in requirements or "aiohttp" in requirements
+            has_http = not requirements.isdisjoint({"requests", "aiohttp"})
             assert has_http, "TOOL should have HTTP client"
             print(f"  ✓ {pattern}: HTTP client included")
         elif pattern == "MAPREDUCE":
@@ -1,72 +1,119 @@
 from __future__ import annotations
 
+from functools import lru_cache
 from typing import List
 
+# Fixture and test methods shared by every generated node test class
+_NODE_TEST_BODY = (
+    "\n"
+    "    @pytest.fixture\n"
+    "    def shared_store(self):\n"
+    '        return {"input_data": "test_data"}\n'
+    "\n"
+    "    def test_prep(self, node, shared_store):\n"
+    '        """Test prep method."""\n'
+    "        result = node.prep(shared_store)\n"
+    '        assert result == "test_data"\n'
+    "\n"
+    "    @pytest.mark.asyncio\n"
+    "    async def test_exec_async(self, node):\n"
+    '        """Test exec_async method."""\n'
+    '        result = await node.exec_async("test_data")\n'
+    '        assert result == "success"\n'
+    "\n"
+    "    def test_post(self, node, shared_store):\n"
+    '        """Test post method."""\n'
+    '        node.post(shared_store, "prep_result", "exec_result")\n'
+    '        assert "output_data" in shared_store\n'
+    "\n"
+)
+
+# Emitted in place of a test module when the spec has nothing for it to test
+_NO_NODE_TESTS = "# No nodes are defined for this workflow.\n"
+_NO_API_TESTS = "# No API endpoints are defined for this workflow.\n"
+
+
+@lru_cache(maxsize=128)
+def _workflow_package_name(spec_name: str) -> str:
+    """Return the package the generated tests import the workflow from.
+
+    Shared by the three test generators, which run back to back for the
+    same spec name during workflow generation.
+    """
+    return spec_name.lower().replace(" ", "")
+
+
+def _render_node_test(node_name: str) -> str:
+    """Render the test class of one node as a single string."""
+    return (
+        f"class Test{node_name}:\n"
+        f'    """Tests for {node_name} node."""\n'
+        "\n"
+        "    @pytest.fixture\n"
+        "    def node(self):\n"
+        f"        return {node_name}()\n"
+        f"{_NODE_TEST_BODY}"
+    )
+
+
+def _render_endpoint_test(endpoint_name: str, method: str, path: str) -> str:
+    """Render the test class of one API endpoint as a single string."""
+    endpoint_key = endpoint_name.lower()
+    return (
+        f"class Test{endpoint_name}Endpoint:\n"
+        f'    """Tests for {endpoint_name} endpoint."""\n'
+        "\n"
+        f"    def test_{endpoint_key}_success(self):\n"
+        f'        """Test successful {endpoint_name} request."""\n'
+        '        request_data = {"test": "data"}\n'
+        f'        response = client.{method}("/api/v1{path}", json=request_data)\n'
+        "        assert response.status_code == 200\n"
+        "\n"
+        f"    def test_{endpoint_key}_validation_error(self):\n"
+        '        """Test validation error handling."""\n'
+        f'        response = client.{method}("/api/v1{path}", json={{}})\n'
+        "        assert response.status_code == 422\n"
+        "\n"
+    )
+
 
 def generate_node_tests(spec) -> str:
     """Generate tests for nodes (legacy parity)."""
-    workflow_name = spec.name.lower().replace(" ", "")
+    if not spec.nodes:
+        return _NO_NODE_TESTS
+
+    workflow_name = _workflow_package_name(spec.name)
+    # Node names are read once for both the import line and the test classes
+    node_names = [node["name"] for node in spec.nodes]
     parts: List[str] = [
         "import pytest",
         "from unittest.mock import AsyncMock, patch",
-        f"from {workflow_name}.nodes import "
-        + ", ".join(node["name"] for node in spec.nodes),
+        f"from {workflow_name}.nodes import {', '.join(node_names)}",
         "",
         "",
     ]
 
-    for node in spec.nodes:
-        parts.extend(
-            [
-                f"class Test{node['name']}:",
-                f'    """Tests for {node["name"]} node."""',
-                "",
-                "    @pytest.fixture",
-                "    def node(self):",
-                f"        return {node['name']}()",
-                "",
-                "    @pytest.fixture",
-                "    def shared_store(self):",
-                '        return {"input_data": "test_data"}',
-                "",
-                "    def test_prep(self, node, shared_store):",
-                '        """Test prep method."""',
-                "        result = node.prep(shared_store)",
-                '        assert result == "test_data"',
-                "",
-                "    @pytest.mark.asyncio",
-                "    async def test_exec_async(self, node):",
-                '        """Test exec_async method."""',
-                '        result = await node.exec_async("test_data")',
-                '        assert result == "success"',
-                "",
-                "    def test_post(self, node, shared_store):",
-                '        """Test post method."""',
-                '        node.post(shared_store, "prep_result", "exec_result")',
-                '        assert "output_data" in shared_store',
-                "",
-                "",
-            ]
-        )
+    parts.extend(map(_render_node_test, node_names))
 
     return "\n".join(parts)
 
 
 def generate_flow_tests(spec) -> str:
     """Generate tests for flow (legacy parity)."""
-    workflow_name = spec.name.lower().replace(" ", "")
+    name = spec.name
+    workflow_name = _workflow_package_name(name)
     parts: List[str] = [
         "import pytest",
         "from unittest.mock import AsyncMock, patch",
-        f"from {workflow_name}.flow import {spec.name}Flow",
+        f"from {workflow_name}.flow import {name}Flow",
         "",
         "",
-        f"class Test{spec.name}Flow:",
-        f'    """Tests for {spec.name}Flow."""',
+        f"class Test{name}Flow:",
+        f'    """Tests for {name}Flow."""',
         "",
         "    @pytest.fixture",
         "    def flow(self):",
-        f"        return {spec.name}Flow()",
+        f"        return {name}Flow()",
         "",
         "    @pytest.fixture",
         "    def shared_store(self):",
@@ -93,7 +140,10 @@ def generate_flow_tests(spec) -> str:
 
 def generate_api_tests(spec) -> str:
     """Generate tests for FastAPI endpoints (legacy parity)."""
-    workflow_name = spec.name.lower().replace(" ", "")
+    if not spec.api_endpoints:
+        return _NO_API_TESTS
+
+    workflow_name = _workflow_package_name(spec.name)
     parts: List[str] = [
         "import pytest",
         "from fastapi.testclient import TestClient",
@@ -109,24 +159,6 @@ def generate_api_tests(spec) -> str:
         method = endpoint.get("method", "post").upper()
         path = endpoint.get("path", f"/{endpoint['name'].lower()}")
 
-        parts.extend(
-            [
-                f"class Test{endpoint['name']}Endpoint:",
-                f'    """Tests for {endpoint["name"]} endpoint."""',
-                "",
-                f"    def test_{endpoint['name'].lower()}_success(self):",
-                f'        """Test successful {endpoint["name"]} request."""',
-                '        request_data = {"test": "data"}',
-                f'        response = client.{method.lower()}("/api/v1{path}", json=request_data)',
-                "        assert response.status_code == 200",
-                "",
-                f"    def test_{endpoint['name'].lower()}_validation_error(self):",
-                '        """Test validation error handling."""',
-                f'        response = client.{method.lower()}("/api/v1{path}", json={{}})',
-                "        assert response.status_code == 422",
-                "",
-                "",
-            ]
-        )
+        parts.append(_render_endpoint_test(endpoint["name"], method.lower(), path))
 
     return "\n".join(parts)
@@ -1,5 +1,8 @@
+from dataclasses import fields
+from datetime import date
+from functools import lru_cache, partial
 from pathlib import Path
-from typing import Dict, List
+from typing import Any, Callable, Dict, List, Mapping, Tuple
 import logging
 import re
 
@@ -29,6 +32,134 @@ from pocketflow_tools.generators.config_generators import (
 )
 from pocketflow_tools.generators.context import GenerationContext
 
+# Exact scalar types a spec snapshot may contain besides str; anything else
+# (including subclasses, whose formatting may differ) bypasses the cache
+_FREEZABLE_SCALARS = (int, float, bool, type(None))
+
+
+def _freeze(value: Any) -> Any:
+    """Return a hashable, type-tagged snapshot of a JSON-like spec value."""
+    kind = type(value)
+    # Strings, by far the most common value, are kept as-is: no tagged tuple
+    # ever compares equal to a str
+    if kind is str:
+        return value
+    if kind is dict:
+        return (dict, tuple((_freeze(k), _freeze(v)) for k, v in value.items()))
+    if kind is list or kind is tuple:
+        return (kind, tuple(_freeze(item) for item in value))
+    if kind in _FREEZABLE_SCALARS:
+        return (kind, value)
+    raise TypeError(f"Cannot freeze {kind.__name__} values")
+
+
+def _thaw(frozen: Any) -> Any:
+    """Rebuild the value captured by _freeze."""
+    if type(frozen) is str:
+        return frozen
+    kind, payload = frozen
+    if kind is dict:
+        return {_thaw(k): _thaw(v) for k, v in payload}
+    if kind is list:
+        return [_thaw(item) for item in payload]
+    if kind is tuple:
+        return tuple(_thaw(item) for item in payload)
+    return payload
+
+
+# Every WorkflowSpec field, in declaration order, as snapshotted for the cache
+_SPEC_FIELDS = tuple(spec_field.name for spec_field in fields(WorkflowSpec))
+
+# (relative path, generator) pair for one file rendered from the enriched spec
+_FileGenerator = Tuple[str, Callable[[WorkflowSpec], str]]
+
+# Per-spec file generators in output order; generate_workflow emits utility
+# modules after the core files and dependency files after the FastAPI ones
+_CORE_FILE_GENERATORS: Tuple[_FileGenerator, ...] = (
+    ("schemas/models.py", generate_pydantic_models),
+    ("nodes.py", generate_nodes),
+    ("flow.py", generate_flow),
+    ("__init__.py", partial(generate_init_file, is_root=True)),
+    ("schemas/__init__.py", partial(generate_init_file, is_schema=True)),
+    ("tests/__init__.py", partial(generate_init_file, is_test=True)),
+    ("utils/__init__.py", partial(generate_init_file, is_utils=True)),
+)
+_FASTAPI_FILE_GENERATORS: Tuple[_FileGenerator, ...] = (
+    ("main.py", generate_fastapi_main),
+    ("router.py", generate_fastapi_router),
+)
+_DOC_AND_TEST_FILE_GENERATORS: Tuple[_FileGenerator, ...] = (
+    ("docs/design.md", generate_design_doc),
+    ("docs/tasks.md", generate_tasks),
+    ("tests/test_nodes.py", generate_node_tests),
+    ("tests/test_flow.py", generate_flow_tests),
+    ("tests/test_api.py", generate_api_tests),
+)
+
+
+@lru_cache(maxsize=8)
+def _load_templates_and_extensions(
+    templates_path: Path, source_signature: Tuple[Tuple[str, int, int], ...]
+) -> Tuple[Dict[str, str], Mapping[str, Any]]:
+    """Load templates and extensions once per on-disk state.
+
+    source_signature only keys the cache: any change to a template or
+    extension file yields a new signature and a fresh load.
+    """
+    engine = TemplateEngine(templates_path)
+    return engine.load_templates(), engine.load_enhanced_extensions()
+
+
+def _render_workflow_files(spec: WorkflowSpec) -> Dict[str, str]:
+    """Render every generated file of an enriched spec, keyed by relative path."""
+    output_files = {}
+
+    # Generate core code files - these return strings, need to map to filenames
+    for relative_path, generate in _CORE_FILE_GENERATORS:
+        output_files[relative_path] = generate(spec)
+
+    # Generate utilities - need to pass individual utilities from spec
+    for utility in spec.utilities:
+        utility_content = generate_utility(utility)
+        utility_name = utility.get("name", "utility").lower()
+        output_files[f"utils/{utility_name}.py"] = utility_content
+
+    # Generate FastAPI components
+    for relative_path, generate in _FASTAPI_FILE_GENERATORS:
+        output_files[relative_path] = generate(spec)
+
+    # Generate configuration files using dependency orchestrator
+    # This returns a Dict[str, str] including pyproject.toml, requirements.txt,
+    # requirements-dev.txt, .gitignore, README.md, uv.toml, .python-version
+    output_files.update(generate_dependency_files(spec))
+
+    # Generate documentation and tests
+    for relative_path, generate in _DOC_AND_TEST_FILE_GENERATORS:
+        output_files[relative_path] = generate(spec)
+
+    # Generate install checker reference - no parameters
+    output_files["check_install.py"] = generate_install_checker_reference()
+
+    return output_files
+
+
+@lru_cache(maxsize=32)
+def _render_frozen_workflow_files(
+    frozen_spec: Tuple[Any, ...], render_date: str
+) -> Dict[str, str]:
+    """Render the files of a spec snapshot taken with _freeze.
+
+    This is the only render cache. Snapshotting a spec costs more than most
+    single generators, so they are not memoized on their own; it is a small
+    fraction of rendering the whole workflow. render_date only keys the
+    cache: the design doc and task list embed the current date, so they are
+    rendered again on a new day.
+    """
+    spec = WorkflowSpec(
+        **{field: _thaw(frozen) for field, frozen in zip(_SPEC_FIELDS, frozen_spec)}
+    )
+    return _render_workflow_files(spec)
+
 
 def _is_likely_plural(name: str) -> bool:
     """Check if a name is likely plural. Reused from _detect_batch_patterns logic."""
@@ -282,12 +413,17 @@ class PocketFlowGenerator:
         # Ensure output directory exists
         self.output_path.mkdir(exist_ok=True, parents=True)
 
-        # Load templates and extensions via new TemplateEngine
+        # Load templates and extensions via new TemplateEngine, reusing an
+        # earlier load while none of the files it reads have changed
         # Create fallback empty context if templates directory doesn't exist
         try:
             engine = TemplateEngine(self.templates_path)
-            templates = engine.load_templates()
-            extensions = engine.load_enhanced_extensions()
+            cached_templates, cached_extensions = _load_templates_and_extensions(
+                self.templates_path, engine.source_signature()
+            )
+            templates = dict(cached_templates)
+            # Read-only and parsed on first access, so it is shared as is
+            extensions = cached_extensions
         except (FileNotFoundError, OSError):
             # Fallback to empty templates/extensions if directory missing
             templates = {}
@@ -820,57 +956,21 @@ class PocketFlowGenerator:
             for error in validation_results["errors"]:
                 logger.error(f"  - {error}")
 
-        output_files = {}
-
-        # Generate core code files - these return strings, need to map to filenames
-        output_files["schemas/models.py"] = generate_pydantic_models(enriched_spec)
-        output_files["nodes.py"] = generate_nodes(enriched_spec)
-        output_files["flow.py"] = generate_flow(enriched_spec)
-        output_files["__init__.py"] = generate_init_file(enriched_spec, is_root=True)
-        output_files["schemas/__init__.py"] = generate_init_file(
-            enriched_spec, is_schema=True
-        )
-        output_files["tests/__init__.py"] = generate_init_file(
-            enriched_spec, is_test=True
-        )
-        output_files["utils/__init__.py"] = generate_init_file(
-            enriched_spec, is_utils=True
+        # Rendering reads nothing but the enriched spec, so equal specs share it
+        try:
+            frozen_spec = tuple(
+                _freeze(getattr(enriched_spec, field)) for field in _SPEC_FIELDS
+            )
+        except TypeError:
+            return _render_workflow_files(enriched_spec)
+        # Callers may edit the returned files, so each call gets its own dict
+        return dict(
+            _render_frozen_workflow_files(frozen_spec, date.today().isoformat())
         )
 
-        # Generate utilities - need to pass individual utilities from spec
-        for utility in enriched_spec.utilities:
-            utility_content = generate_utility(utility)
-            utility_name = utility.get("name", "utility").lower()
-            output_files[f"utils/{utility_name}.py"] = utility_content
-
-        # Generate FastAPI components
-        output_files["main.py"] = generate_fastapi_main(enriched_spec)
-        output_files["router.py"] = generate_fastapi_router(enriched_spec)
-
-        # Generate configuration files using dependency orchestrator
-        # This returns a Dict[str, str] including pyproject.toml, requirements.txt,
-        # requirements-dev.txt, .gitignore, README.md, uv.toml, .python-version
-        output_files.update(generate_dependency_files(enriched_spec))
-
-        # Generate documentation
-        output_files["docs/design.md"] = generate_design_doc(enriched_spec)
-        output_files["docs/tasks.md"] = generate_tasks(enriched_spec)
-
-        # Generate tests
-        output_files["tests/test_nodes.py"] = generate_node_tests(enriched_spec)
-        output_files["tests/test_flow.py"] = generate_flow_tests(enriched_spec)
-        output_files["tests/test_api.py"] = generate_api_tests(enriched_spec)
-
-        # Generate install checker reference - no parameters
-        output_files["check_install.py"] = generate_install_checker_reference()
-
-        return output_files
-
     def save_workflow(self, spec: WorkflowSpec, output_files: Dict[str, str]) -> None:
         """Save generated workflow files to disk."""
         # Safely sanitize workflow directory name
-        import re
-
         safe_name = re.sub(r"[^a-zA-Z0-9]", "", spec.name.lower())
         if not safe_name:  # Fallback if name becomes empty after sanitization
             safe_name = "workflow"
@@ -878,10 +978,16 @@ class PocketFlowGenerator:
         workflow_dir = self.output_path / safe_name
         workflow_dir.mkdir(parents=True, exist_ok=True)
 
+        workflow_root = str(workflow_dir)
+        # Most files share a few directories; create each of them only once
+        created_dirs = {workflow_dir}
         for relative_path, content in output_files.items():
             file_path = workflow_dir / relative_path
             # Ensure we don't create files outside the workflow directory
-            if not str(file_path).startswith(str(workflow_dir)):
+            if not str(file_path).startswith(workflow_root):
                 continue  # Skip potentially dangerous paths
-            file_path.parent.mkdir(parents=True, exist_ok=True)
+            parent = file_path.parent
+            if parent not in created_dirs:
+                parent.mkdir(parents=True, exist_ok=True)
+                created_dirs.add(parent)
             file_path.write_text(content, encoding="utf-8")
@@ -8,11 +8,15 @@ monolithic nodes that are hard to test, debug, and maintain.
 DO NOT COPY THESE PATTERNS - Use templates/examples/good/ instead.
 """
 
-from typing import Dict, Any, Optional, List
-from pocketflow import SharedStore, Node, BatchNode
+from typing import Dict, Any, Optional, List, Callable, Iterator
+from pocketflow import SharedStore, Node, BatchNode, AsyncNode
+import asyncio
 import requests
 import json
-from datetime import datetime
+from datetime import datetime, timezone
+
+# Rough prompt budget: ~4 characters per token for a 4k-token context window
+MAX_PROMPT_CHARS = 16_000
 
 
 class ProcessAndValidateAndSendNode(Node):
@@ -36,14 +40,11 @@ class ProcessAndValidateAndSendNode(Node):
     6. Multiple LLM calls for different purposes
     """
     
+    PREP_KEYS = ('user_data', 'email_config', 'api_config', 'database_config')
+    
     def prep(self, shared: SharedStore) -> Dict[str, Any]:
         """Prepare data for monolithic processing."""
-        return {
-            'user_data': shared.get('user_data'),
-            'email_config': shared.get('email_config'),
-            'api_config': shared.get('api_config'),
-            'database_config': shared.get('database_config')
-        }
+        return {key: shared.get(key) for key in self.PREP_KEYS}
     
     def exec(self, prep_result: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -57,15 +58,23 @@ class ProcessAndValidateAndSendNode(Node):
         api_config = prep_result['api_config']
         database_config = prep_result['database_config']
         
+        # One timestamp per record: shared by processed_at and analytics
+        now_iso = datetime.now(timezone.utc).isoformat()
+        
         results = {}
         
+        # Read each user field once; validation and processing share them
+        name = user_data.get('name', '')
+        email = user_data.get('email', '')
+        age = user_data.get('age', 0)
+        
         # ❌ RESPONSIBILITY 1: Data validation (should be separate node)
         validation_errors = []
-        if not user_data.get('name'):
+        if not name:
             validation_errors.append('Name is required')
-        if not user_data.get('email') or '@' not in user_data['email']:
+        if not email or '@' not in email:
             validation_errors.append('Valid email is required')
-        if user_data.get('age', 0) < 0:
+        if age < 0:
             validation_errors.append('Age must be positive')
         
         if validation_errors:
@@ -76,10 +85,10 @@ class ProcessAndValidateAndSendNode(Node):
         # ❌ RESPONSIBILITY 2: Data processing (should be separate node)
         processed_data = {
             'id': user_data.get('id'),
-            'name': user_data.get('name', '').title(),
-            'email': user_data.get('email', '').lower(),
-            'age': user_data.get('age', 0),
-            'processed_at': datetime.now().isoformat()
+            'name': name.title(),
+            'email': email.lower(),
+            'age': age,
+            'processed_at': now_iso
         }
         
         # ❌ RESPONSIBILITY 3: External API call (should be separate AsyncNode)
@@ -90,7 +99,9 @@ class ProcessAndValidateAndSendNode(Node):
                 headers={'Authorization': f"Bearer {api_config['token']}"},
                 timeout=30
             )
-            api_data = api_response.json()
+            # json.loads accepts bytes directly, skipping the text decode
+            # and charset detection that Response.json() goes through
+            api_data = json.loads(api_response.content)
             processed_data['external_id'] = api_data.get('id')
         except Exception as e:
             results['api_error'] = str(e)
@@ -129,7 +140,7 @@ class ProcessAndValidateAndSendNode(Node):
             analytics_data = {
                 'event': 'user_processed',
                 'user_id': processed_data['id'],
-                'timestamp': datetime.now().isoformat(),
+                'timestamp': now_iso,
                 'metadata': {
                     'validation_errors': len(validation_errors),
                     'api_success': 'api_error' not in results,
@@ -143,20 +154,28 @@ class ProcessAndValidateAndSendNode(Node):
         
         # ❌ MULTIPLE LLM CALLS: Should be in separate nodes
         try:
+            # Serialize once for every prompt that embeds the record
+            processed_json = json.dumps(processed_data)
+            
             # LLM call 1: Content generation
             content_prompt = f"Generate a welcome message for {processed_data['name']}"
             welcome_message = self._call_llm(content_prompt)
             results['welcome_message'] = welcome_message
             
-            # LLM call 2: Data classification
-            classification_prompt = f"Classify this user data: {json.dumps(processed_data)}"
-            user_classification = self._call_llm(classification_prompt)
-            results['user_classification'] = user_classification
-            
-            # LLM call 3: Risk assessment
-            risk_prompt = f"Assess risk level for user: {processed_data}"
-            risk_assessment = self._call_llm(risk_prompt)
-            results['risk_assessment'] = risk_assessment
+            # Both remaining prompts embed the record; skip calls that are
+            # known to exceed the context budget instead of failing late
+            if len(processed_json) > MAX_PROMPT_CHARS:
+                results['llm_error'] = 'prompt too long'
+            else:
+                # LLM call 2: Data classification
+                classification_prompt = f"Classify this user data: {processed_json}"
+                user_classification = self._call_llm(classification_prompt)
+                results['user_classification'] = user_classification
+                
+                # LLM call 3: Risk assessment
+                risk_prompt = f"Assess risk level for user: {processed_json}"
+                risk_assessment = self._call_llm(risk_prompt)
+                results['risk_assessment'] = risk_assessment
             
         except Exception as e:
             results['llm_error'] = str(e)
@@ -225,14 +244,12 @@ class MegaBatchProcessor(BatchNode):
     - Complex state sharing between batch items
     """
     
+    PREP_KEYS = ('files', 'api_data', 'emails', 'reports')
+    
     def prep(self, shared: SharedStore) -> Dict[str, Any]:
         """Prepare for monolithic batch processing."""
-        return {
-            'files': shared.get('files', []),
-            'api_data': shared.get('api_data', []),
-            'emails': shared.get('emails', []),
-            'reports': shared.get('reports', [])
-        }
+        # Missing collections default to empty lists, one new list per key
+        return {key: shared.get(key, []) for key in self.PREP_KEYS}
     
     def exec(self, prep_result: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -253,89 +270,27 @@ class MegaBatchProcessor(BatchNode):
             'file_cache': {}
         }
         
+        # ❌ Processing different data types with different logic in one node.
+        # Each category is drained from one generator, so there is no
+        # per-record results[...].append(...) lookup.
         results = {
-            'file_results': [],
-            'api_results': [],
-            'email_results': [],
-            'report_results': []
+            'file_results': list(self._stream_results(
+                files, self._process_file, 'file', 'content', shared_state
+            )),
+            # ❌ Mixing API calls in the same batch (should be in AsyncNode)
+            'api_results': list(self._stream_results(
+                api_data, self._make_api_call, 'item', 'response', shared_state
+            )),
+            # ❌ Email processing mixed with other operations
+            'email_results': list(self._stream_results(
+                emails, self._send_email, 'email', 'result', shared_state
+            )),
+            # ❌ Report generation mixed with other operations
+            'report_results': list(self._stream_results(
+                reports, self._generate_report, 'config', 'report', shared_state
+            ))
         }
         
-        # ❌ Processing different data types with different logic
-        for file_path in files:
-            try:
-                # File processing logic
-                content = self._process_file(file_path, shared_state)
-                results['file_results'].append({
-                    'file': file_path,
-                    'content': content,
-                    'success': True
-                })
-                shared_state['processed_count'] += 1
-            except Exception as e:
-                results['file_results'].append({
-                    'file': file_path,
-                    'error': str(e),
-                    'success': False
-                })
-                shared_state['error_count'] += 1
-        
-        # ❌ Mixing API calls in the same batch loop
-        for api_item in api_data:
-            try:
-                # API processing logic (should be in AsyncNode)
-                response = self._make_api_call(api_item, shared_state)
-                results['api_results'].append({
-                    'item': api_item,
-                    'response': response,
-                    'success': True
-                })
-                shared_state['processed_count'] += 1
-            except Exception as e:
-                results['api_results'].append({
-                    'item': api_item,
-                    'error': str(e),
-                    'success': False
-                })
-                shared_state['error_count'] += 1
-        
-        # ❌ Email processing mixed with other operations
-        for email_data in emails:
-            try:
-                # Email sending logic
-                result = self._send_email(email_data, shared_state)
-                results['email_results'].append({
-                    'email': email_data,
-                    'result': result,
-                    'success': True
-                })
-                shared_state['processed_count'] += 1
-            except Exception as e:
-                results['email_results'].append({
-                    'email': email_data,
-                    'error': str(e),
-                    'success': False
-                })
-                shared_state['error_count'] += 1
-        
-        # ❌ Report generation mixed with other operations
-        for report_config in reports:
-            try:
-                # Report generation logic
-                report = self._generate_report(report_config, shared_state)
-                results['report_results'].append({
-                    'config': report_config,
-                    'report': report,
-                    'success': True
-                })
-                shared_state['processed_count'] += 1
-            except Exception as e:
-                results['report_results'].append({
-                    'config': report_config,
-                    'error': str(e),
-                    'success': False
-                })
-                shared_state['error_count'] += 1
-        
         results['summary'] = shared_state
         return results
     
@@ -362,6 +317,25 @@ class MegaBatchProcessor(BatchNode):
         
         return None
     
+    def _stream_results(
+        self,
+        items: List[Any],
+        handler: Callable[[Any, Dict[str, Any]], Any],
+        item_key: str,
+        value_key: str,
+        shared_state: Dict[str, Any]
+    ) -> Iterator[Dict[str, Any]]:
+        """Yield one result record per item as soon as it is handled."""
+        for item in items:
+            try:
+                value = handler(item, shared_state)
+            except Exception as e:
+                shared_state['error_count'] += 1
+                yield {item_key: item, 'error': str(e), 'success': False}
+            else:
+                shared_state['processed_count'] += 1
+                yield {item_key: item, value_key: value, 'success': True}
+    
     def _process_file(self, file_path: str, shared_state: Dict[str, Any]) -> str:
         """❌ File processing logic embedded in batch node."""
         # This should be a separate file processing node
@@ -383,7 +357,7 @@ class MegaBatchProcessor(BatchNode):
         pass
 
 
-class GodClassProcessingNode(Node):
+class GodClassProcessingNode(AsyncNode):
     """
     ❌ ANTIPATTERN: God class that knows about everything
     
@@ -392,6 +366,9 @@ class GodClassProcessingNode(Node):
     - Implementing multiple business domains
     - Having too many dependencies
     - Being impossible to test in isolation
+    
+    As an AsyncNode it must be run with ``await node.run_async(shared)``;
+    the sync ``run()`` is not available.
     """
     
     def __init__(self):
@@ -405,82 +382,88 @@ class GodClassProcessingNode(Node):
         self.analytics_tracker = None # Should be injected
         self.notification_service = None # Should be injected
     
-    def prep(self, shared: SharedStore) -> Dict[str, Any]:
+    # ❌ Reading from too many SharedStore keys
+    PREP_KEYS = (
+        'user_data',
+        'order_data',
+        'inventory_data',
+        'payment_data',
+        'shipping_data',
+        'analytics_data',
+        'notification_preferences',
+        'business_rules',
+        'system_config'
+    )
+    
+    async def prep_async(self, shared: SharedStore) -> Dict[str, Any]:
         """Prepare for god-class processing."""
-        # ❌ Reading from too many SharedStore keys
-        return {
-            'user_data': shared.get('user_data'),
-            'order_data': shared.get('order_data'),
-            'inventory_data': shared.get('inventory_data'),
-            'payment_data': shared.get('payment_data'),
-            'shipping_data': shared.get('shipping_data'),
-            'analytics_data': shared.get('analytics_data'),
-            'notification_preferences': shared.get('notification_preferences'),
-            'business_rules': shared.get('business_rules'),
-            'system_config': shared.get('system_config')
-        }
+        return {key: shared.get(key) for key in self.PREP_KEYS}
     
-    def exec(self, prep_result: Dict[str, Any]) -> Dict[str, Any]:
+    async def exec_async(self, prep_result: Dict[str, Any]) -> Dict[str, Any]:
         """
         ❌ ANTIPATTERN: God method that handles multiple business domains
         
         This method violates the single responsibility principle by
         handling user management, order processing, inventory, payments,
         shipping, analytics, and notifications all in one place.
-        """
-        # ❌ DOMAIN 1: User management
-        user_result = self._handle_user_operations(prep_result['user_data'])
-        
-        # ❌ DOMAIN 2: Order processing  
-        order_result = self._handle_order_operations(
-            prep_result['order_data'], 
-            prep_result['business_rules']
-        )
         
-        # ❌ DOMAIN 3: Inventory management
-        inventory_result = self._handle_inventory_operations(
-            prep_result['inventory_data'],
-            order_result
-        )
-        
-        # ❌ DOMAIN 4: Payment processing
-        payment_result = self._handle_payment_operations(
-            prep_result['payment_data'],
-            order_result
-        )
-        
-        # ❌ DOMAIN 5: Shipping calculations
-        shipping_result = self._handle_shipping_operations(
-            prep_result['shipping_data'],
-            order_result,
-            user_result
+        The domains are at least scheduled by dependency level rather than
+        one after another: {user, order} -> {inventory, payment, shipping}
+        -> {analytics, notifications}.
+        """
+        # ❌ DOMAIN 1 + 2: User management and order processing (independent)
+        user_result, order_result = await asyncio.gather(
+            self._handle_user_operations(prep_result['user_data']),
+            self._handle_order_operations(
+                prep_result['order_data'], 
+                prep_result['business_rules']
+            )
         )
         
-        # ❌ DOMAIN 6: Analytics tracking
-        analytics_result = self._handle_analytics_operations(
-            prep_result['analytics_data'],
-            user_result,
-            order_result,
-            payment_result
+        # ❌ DOMAIN 3 + 4 + 5: Inventory, payment and shipping (need the order)
+        inventory_result, payment_result, shipping_result = await asyncio.gather(
+            self._handle_inventory_operations(
+                prep_result['inventory_data'],
+                order_result
+            ),
+            self._handle_payment_operations(
+                prep_result['payment_data'],
+                order_result
+            ),
+            self._handle_shipping_operations(
+                prep_result['shipping_data'],
+                order_result,
+                user_result
+            )
         )
         
-        # ❌ DOMAIN 7: Notification sending
-        notification_result = self._handle_notification_operations(
-            prep_result['notification_preferences'],
-            user_result,
-            order_result,
-            payment_result,
-            shipping_result
+        # ❌ DOMAIN 6 + 7: Analytics and notifications (need upstream results)
+        analytics_result, notification_result = await asyncio.gather(
+            self._handle_analytics_operations(
+                prep_result['analytics_data'],
+                user_result,
+                order_result,
+                payment_result
+            ),
+            self._handle_notification_operations(
+                prep_result['notification_preferences'],
+                user_result,
+                order_result,
+                payment_result,
+                shipping_result
+            )
         )
         
         # ❌ Complex interdependencies between domains
         if payment_result['status'] == 'failed':
-            # Rollback inventory
-            self._rollback_inventory(inventory_result)
-            # Cancel shipping
-            self._cancel_shipping(shipping_result)
-            # Send failure notifications
-            self._send_failure_notifications(notification_result, payment_result)
+            # Compensations are independent, so run them side by side;
+            # TaskGroup cancels the remaining ones if any of them fails
+            async with asyncio.TaskGroup() as tg:
+                tg.create_task(self._rollback_inventory(inventory_result))
+                tg.create_task(self._cancel_shipping(shipping_result))
+                tg.create_task(
+                    self._send_failure_notifications(notification_result, payment_result)
+                )
         
         return {
             'user_result': user_result,
@@ -496,7 +479,7 @@ class GodClassProcessingNode(Node):
             ])
         }
     
-    def post(self, shared: SharedStore, prep_result: Dict[str, Any], exec_result: Dict[str, Any]) -> Optional[str]:
+    async def post_async(self, shared: SharedStore, prep_result: Dict[str, Any], exec_result: Dict[str, Any]) -> Optional[str]:
         """❌ Complex post method handling multiple domains."""
         # ❌ Updating too many SharedStore keys
         shared['user_result'] = exec_result['user_result']
@@ -520,49 +503,49 @@ class GodClassProcessingNode(Node):
         
         return None
     
-    def _handle_user_operations(self, user_data: Dict[str, Any]) -> Dict[str, Any]:
+    async def _handle_user_operations(self, user_data: Dict[str, Any]) -> Dict[str, Any]:
         """❌ User domain logic in god class."""
         # This entire method should be a separate UserProcessingNode
         pass
     
-    def _handle_order_operations(self, order_data: Dict[str, Any], rules: Dict[str, Any]) -> Dict[str, Any]:
+    async def _handle_order_operations(self, order_data: Dict[str, Any], rules: Dict[str, Any]) -> Dict[str, Any]:
         """❌ Order domain logic in god class."""  
         # This entire method should be a separate OrderProcessingNode
         pass
     
-    def _handle_inventory_operations(self, inventory_data: Dict[str, Any], order_result: Dict[str, Any]) -> Dict[str, Any]:
+    async def _handle_inventory_operations(self, inventory_data: Dict[str, Any], order_result: Dict[str, Any]) -> Dict[str, Any]:
         """❌ Inventory domain logic in god class."""
         # This entire method should be a separate InventoryNode
         pass
     
-    def _handle_payment_operations(self, payment_data: Dict[str, Any], order_result: Dict[str, Any]) -> Dict[str, Any]:
+    async def _handle_payment_operations(self, payment_data: Dict[str, Any], order_result: Dict[str, Any]) -> Dict[str, Any]:
         """❌ Payment domain logic in god class."""
         # This entire method should be a separate PaymentNode
         pass
     
-    def _handle_shipping_operations(self, shipping_data: Dict[str, Any], order_result: Dict[str, Any], user_result: Dict[str, Any]) -> Dict[str, Any]:
+    async def _handle_shipping_operations(self, shipping_data: Dict[str, Any], order_result: Dict[str, Any], user_result: Dict[str, Any]) -> Dict[str, Any]:
         """❌ Shipping domain logic in god class."""
         # This entire method should be a separate ShippingNode
         pass
     
-    def _handle_analytics_operations(self, analytics_data: Dict[str, Any], *results) -> Dict[str, Any]:
+    async def _handle_analytics_operations(self, analytics_data: Dict[str, Any], *results) -> Dict[str, Any]:
         """❌ Analytics domain logic in god class."""
         # This entire method should be a separate AnalyticsNode
         pass
     
-    def _handle_notification_operations(self, preferences: Dict[str, Any], *results) -> Dict[str, Any]:
+    async def _handle_notification_operations(self, preferences: Dict[str, Any], *results) -> Dict[str, Any]:
         """❌ Notification domain logic in god class."""
         # This entire method should be a separate NotificationNode
         pass
     
     # ❌ Too many private helper methods indicate too many responsibilities
-    def _rollback_inventory(self, inventory_result: Dict[str, Any]) -> None:
+    async def _rollback_inventory(self, inventory_result: Dict[str, Any]) -> None:
         pass
     
-    def _cancel_shipping(self, shipping_result: Dict[str, Any]) -> None:
+    async def _cancel_shipping(self, shipping_result: Dict[str, Any]) -> None:
         pass
     
-    def _send_failure_notifications(self, notification_result: Dict[str, Any], payment_result: Dict[str, Any]) -> None:
+    async def _send_failure_notifications(self, notification_result: Dict[str, Any], payment_result: Dict[str, Any]) -> None:
         pass
     
     def _determine_overall_success(self, results: List[Dict[str, Any]]) -> bool:
@@ -5,9 +5,12 @@ This example demonstrates the correct way to implement batch processing
 using BatchNode and AsyncParallelBatchNode for efficient collection handling.
 """
 
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional, Tuple
 from pocketflow import SharedStore, BatchNode, AsyncParallelBatchNode
 import asyncio
+import time
+from collections import defaultdict
+from itertools import zip_longest
 
 
 class DocumentBatchProcessor(BatchNode):
@@ -25,6 +28,8 @@ class DocumentBatchProcessor(BatchNode):
         """Prepare batch processing parameters and validate input."""
         documents = shared.get("documents", [])
         batch_size = shared.get("batch_size", 5)
+        inter_batch_delay = shared.get("inter_batch_delay", 0)
+        target_batch_latency = shared.get("target_batch_latency")
 
         if not documents:
             raise ValueError("No documents provided for processing")
@@ -33,9 +38,15 @@ class DocumentBatchProcessor(BatchNode):
         if batch_size <= 0:
             batch_size = 5
 
+        # Adaptive batch sizing is opt-in; ignore non-positive targets
+        if target_batch_latency is not None and target_batch_latency <= 0:
+            target_batch_latency = None
+
         return {
             "documents": documents,
             "batch_size": batch_size,
+            "inter_batch_delay": inter_batch_delay,
+            "target_batch_latency": target_batch_latency,
             "total_documents": len(documents),
         }
 
@@ -43,45 +54,64 @@ class DocumentBatchProcessor(BatchNode):
         """Process documents in batches with proper error handling."""
         documents = prep_result["documents"]
         batch_size = prep_result["batch_size"]
-
-        # Split into batches
-        batches = [
-            documents[i : i + batch_size] for i in range(0, len(documents), batch_size)
-        ]
+        inter_batch_delay = prep_result["inter_batch_delay"]
+        target_latency = prep_result["target_batch_latency"]
 
         processed_results = []
         failed_batches = []
-
-        for i, batch in enumerate(batches):
+        latency_samples = []
+
+        # Slice each batch only when it is processed. With a target latency
+        # the batch size adapts AIMD-style: grow by one after a batch that
+        # finishes in time, shrink by 10% after one that overruns.
+        current_batch_size = batch_size
+        total_batches = 0
+        offset = 0
+
+        # Resolve bound methods once rather than on every batch
+        log_info = self.logger.info
+        log_error = self.logger.error
+        process_batch = self._process_batch
+
+        while offset < len(documents):
+            i = total_batches
+            batch = documents[offset : offset + current_batch_size]
+            offset += len(batch)
             try:
-                self.logger.info(f"Processing batch {i + 1}/{len(batches)}")
+                log_info(f"Processing batch {i + 1} ({len(batch)} documents)")
 
-                # Process each document in the batch
-                batch_results = []
-                for doc in batch:
-                    processed_doc = self._process_single_document(doc)
-                    batch_results.append(processed_doc)
+                started = time.perf_counter()
+                processed_results.extend(process_batch(batch))
+                elapsed = time.perf_counter() - started
+                latency_samples.append({"batch_size": len(batch), "latency_s": elapsed})
 
-                processed_results.extend(batch_results)
+                if target_latency is not None:
+                    if elapsed > target_latency:
+                        current_batch_size = max(1, int(current_batch_size * 0.9))
+                    else:
+                        current_batch_size += 1
 
-                # Small delay to avoid overwhelming downstream systems
-                if i < len(batches) - 1:
-                    asyncio.sleep(0.1)
+                # Optional delay to avoid overwhelming downstream systems
+                if inter_batch_delay > 0 and offset < len(documents):
+                    time.sleep(inter_batch_delay)
 
             except Exception as e:
-                self.logger.error(
+                log_error(
                     f"Batch {i + 1} failed: {str(e)}",
                     extra={"batch_size": len(batch), "batch_index": i},
                 )
                 failed_batches.append(i)
 
+            total_batches += 1
+
         return {
             "processed_results": processed_results,
             "batch_stats": {
-                "total_batches": len(batches),
-                "successful_batches": len(batches) - len(failed_batches),
+                "total_batches": total_batches,
+                "successful_batches": total_batches - len(failed_batches),
                 "failed_batches": failed_batches,
                 "success_rate": len(processed_results) / len(documents),
+                "latency_samples": latency_samples,
             },
         }
 
@@ -105,14 +135,40 @@ class DocumentBatchProcessor(BatchNode):
 
         return None  # Complete success
 
-    def _process_single_document(self, document: Dict[str, Any]) -> Dict[str, Any]:
-        """Process a single document. This is a pure function with no side effects."""
+    def _process_batch(self, batch: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Process a whole batch column-wise. This is a pure function with no side effects.
+
+        The two fields we read are pulled out of the document dicts once into
+        id and content columns; cleaning and word counting then run over the
+        contiguous content column in C-level str methods, and output records
+        are only assembled at the end.
+        """
+        clean = self._clean_content
+        build = self._process_single_document
+
+        ids = [doc.get("id", "unknown") for doc in batch]
+        contents = [doc.get("content", "") for doc in batch]
+        cleaned = [clean(content) for content in contents]
+        word_counts = [len(content.split()) for content in contents]
+
+        return [
+            build(doc_id, content, word_count)
+            for doc_id, content, word_count in zip(
+                ids, cleaned, word_counts, strict=True
+            )
+        ]
+
+    def _process_single_document(
+        self, doc_id: Any, cleaned_content: str, word_count: int
+    ) -> Dict[str, Any]:
+        """Build the processed record from a document's precomputed columns."""
         # Example processing: extract metadata and content
         processed = {
-            "id": document.get("id", "unknown"),
-            "processed_content": self._clean_content(document.get("content", "")),
+            "id": doc_id,
+            "processed_content": cleaned_content,
             "metadata": {
-                "word_count": len(document.get("content", "").split()),
+                "word_count": word_count,
                 "processed_at": "timestamp_placeholder",
             },
         }
@@ -136,39 +192,119 @@ class AsyncDocumentProcessor(AsyncParallelBatchNode):
         """Prepare async processing parameters."""
         documents = shared.get("documents", [])
         max_concurrent = shared.get("max_concurrent", 3)
+        max_batch = shared.get("max_batch", 16)
+        # exec_async always runs at least one worker, so the default shard
+        # limit follows max_concurrent clamped the same way
+        max_concurrent_per_shard = shared.get(
+            "max_concurrent_per_shard", max(1, max_concurrent)
+        )
+        max_requests_per_second = shared.get("max_requests_per_second")
+
+        # Validate batch size
+        if max_batch <= 0:
+            max_batch = 16
+
+        # Downstream limits have no safe default to fall back to: a shard
+        # limit below 1 would block every worker, and pacing needs a rate
+        if max_concurrent_per_shard <= 0:
+            raise ValueError(
+                "max_concurrent_per_shard must be at least 1, "
+                f"got {max_concurrent_per_shard}"
+            )
+        if max_requests_per_second is not None and max_requests_per_second <= 0:
+            raise ValueError(
+                "max_requests_per_second must be positive or None, "
+                f"got {max_requests_per_second}"
+            )
 
         return {
             "documents": documents,
             "max_concurrent": max_concurrent,
+            "max_batch": max_batch,
+            "max_concurrent_per_shard": max_concurrent_per_shard,
+            "max_requests_per_second": max_requests_per_second,
             "total_count": len(documents),
         }
 
     async def exec_async(self, prep_result: Dict[str, Any]) -> Dict[str, Any]:
-        """Process documents concurrently with controlled parallelism."""
+        """Process documents in coalesced batches with controlled parallelism."""
         documents = prep_result["documents"]
         max_concurrent = prep_result["max_concurrent"]
-
-        # Use semaphore to control concurrency
-        semaphore = asyncio.Semaphore(max_concurrent)
-
-        async def process_with_semaphore(doc):
-            async with semaphore:
-                return await self._process_document_async(doc)
-
-        # Process all documents concurrently
-        tasks = [process_with_semaphore(doc) for doc in documents]
-        results = await asyncio.gather(*tasks, return_exceptions=True)
-
-        # Separate successful results from exceptions
-        successful_results = []
+        max_batch = prep_result["max_batch"]
+        max_per_shard = prep_result["max_concurrent_per_shard"]
+        max_rate = prep_result["max_requests_per_second"]
+
+        planned = self._plan_batches(documents, max_batch)
+
+        # Per-shard concurrency limits plus optional request pacing keep each
+        # downstream below its own capacity
+        shard_limits = defaultdict(lambda: asyncio.Semaphore(max_per_shard))
+        loop = asyncio.get_running_loop()
+        next_request_at = loop.time()
+
+        async def throttle():
+            nonlocal next_request_at
+            if not max_rate:
+                return
+            now = loop.time()
+            delay = next_request_at - now
+            next_request_at = max(now, next_request_at) + 1 / max_rate
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+        async def process_document(doc):
+            await throttle()
+            return await self._process_document_async(doc)
+
+        # A fixed pool of max_concurrent workers pulls planned batches from
+        # one shared iterator. Each worker awaits one downstream call at a
+        # time, bulk or per-document fallback, so at most max_concurrent
+        # calls are ever in flight.
+        pending = iter(planned)
+        successes: List[Optional[Dict[str, Any]]] = [None] * len(documents)
         failed_count = 0
 
-        for i, result in enumerate(results):
-            if isinstance(result, Exception):
-                self.logger.error(f"Document {i} failed: {str(result)}")
-                failed_count += 1
-            else:
-                successful_results.append(result)
+        async def worker():
+            nonlocal failed_count
+            for shard, indices in pending:
+                batch = [documents[index] for index in indices]
+                async with shard_limits[shard]:
+                    try:
+                        # One bulk call amortizes the per-request overhead
+                        await throttle()
+                        results = await self._process_document_batch_async(batch)
+                        # A short or long reply cannot be matched to its
+                        # documents, so it counts as a failed bulk call
+                        if len(results) != len(batch):
+                            raise ValueError(
+                                f"Bulk call returned {len(results)} results "
+                                f"for {len(batch)} documents"
+                            )
+                    except Exception:
+                        # Fall back to per-document calls so a bad document
+                        # only fails itself, not the whole batch. They run one
+                        # at a time: the worker is a single max_concurrent slot
+                        results = []
+                        for doc in batch:
+                            try:
+                                results.append(await process_document(doc))
+                            except Exception as error:
+                                results.append(error)
+
+                # Separate successful results from exceptions as each
+                # batch completes
+                for index, result in zip(indices, results, strict=True):
+                    if isinstance(result, Exception):
+                        self.logger.error(f"Document {index} failed: {str(result)}")
+                        failed_count += 1
+                    else:
+                        successes[index] = result
+
+        worker_count = max(1, min(max_concurrent, len(planned)))
+        await asyncio.gather(*(worker() for _ in range(worker_count)))
+
+        # Keep the input order regardless of which worker finished first
+        successful_results = [result for result in successes if result is not None]
 
         return {
             "processed_documents": successful_results,
@@ -177,6 +313,35 @@ class AsyncDocumentProcessor(AsyncParallelBatchNode):
             "total_count": len(documents),
         }
 
+    def _plan_batches(
+        self, documents: List[Dict[str, Any]], max_batch: int
+    ) -> List[Tuple[Any, List[int]]]:
+        """
+        Coalesce documents into (shard, indices) bulk requests of at most
+        max_batch items. This is a pure function with no side effects.
+
+        A batch never mixes shards, so each request targets one downstream,
+        and shards are interleaved so one busy shard cannot stall the rest.
+        """
+        shard_indices: Dict[Any, List[int]] = defaultdict(list)
+        for index, doc in enumerate(documents):
+            shard = doc.get("shard", "default") if isinstance(doc, dict) else "default"
+            shard_indices[shard].append(index)
+
+        shard_batches = [
+            [
+                (shard, indices[start : start + max_batch])
+                for start in range(0, len(indices), max_batch)
+            ]
+            for shard, indices in shard_indices.items()
+        ]
+        return [
+            batch
+            for batches in zip_longest(*shard_batches)
+            for batch in batches
+            if batch is not None
+        ]
+
     def post(
         self,
         shared: SharedStore,
@@ -198,11 +363,24 @@ class AsyncDocumentProcessor(AsyncParallelBatchNode):
 
         return None
 
+    async def _process_document_batch_async(
+        self, documents: List[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """Async processing of a batch of documents in one I/O round trip."""
+        # Simulate one bulk I/O operation (e.g. a single POST with N items)
+        await asyncio.sleep(0.1)
+
+        return [self._enhance_document(doc) for doc in documents]
+
     async def _process_document_async(self, document: Dict[str, Any]) -> Dict[str, Any]:
         """Async processing of a single document (simulating I/O operations)."""
         # Simulate async I/O operation
         await asyncio.sleep(0.1)
 
+        return self._enhance_document(document)
+
+    def _enhance_document(self, document: Dict[str, Any]) -> Dict[str, Any]:
+        """Build the enhanced document from the I/O result."""
         # Example: fetch additional data or call external API
         enhanced_doc = {
             "original_id": document.get("id"),
@@ -249,10 +427,16 @@ if __name__ == "__main__":
         exec_result = await async_processor.exec_async(prep_result)
         action = async_processor.post(shared_async, prep_result, exec_result)
 
-        print(
-            f"Async processed {len(shared_async['async_processed_documents'])} documents"
-        )
+        processed_count = len(shared_async["async_processed_documents"])
+        print(f"Async processed {processed_count} documents")
         print(f"Processing stats: {shared_async['processing_stats']}")
         print(f"Next action: {action}")
 
-    asyncio.run(test_async())
+    # uvloop is optional: it speeds up the event loop on Linux/macOS and is
+    # not available on Windows, where the default asyncio loop is used
+    try:
+        import uvloop
+    except ImportError:
+        asyncio.run(test_async())
+    else:
+        uvloop.run(test_async())
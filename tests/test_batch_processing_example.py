@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+import asyncio
+import importlib.util
+import logging
+import sys
+import types
+from pathlib import Path
+
+import pytest
+
+EXAMPLE_PATH = (
+    Path(__file__).resolve().parent.parent
+    / "templates"
+    / "examples"
+    / "good"
+    / "batch_processing.py"
+)
+
+
+def load_example():
+    spec = importlib.util.spec_from_file_location("batch_processing", EXAMPLE_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture
+def example(monkeypatch):
+    """Load the example, with bare base classes if pocketflow is missing.
+
+    prep and batch planning never call into the pocketflow base classes, so
+    they are tested either way; running exec_async needs the real package.
+    """
+    if importlib.util.find_spec("pocketflow") is None:
+        stand_in = types.ModuleType("pocketflow")
+        stand_in.SharedStore = dict
+        stand_in.BatchNode = stand_in.AsyncParallelBatchNode = object
+        monkeypatch.setitem(sys.modules, "pocketflow", stand_in)
+    return load_example()
+
+
+class CountingProcessor:
+    """Mixin recording the peak number of downstream calls in flight."""
+
+    logger = logging.getLogger(__name__)
+
+    def __init__(self):
+        super().__init__()
+        self.in_flight = 0
+        self.peak_in_flight = 0
+
+    async def _track(self):
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(0.001)
+        finally:
+            self.in_flight -= 1
+
+    async def _process_document_batch_async(self, documents):
+        await self._track()
+        raise RuntimeError("bulk endpoint unavailable")
+
+    async def _process_document_async(self, document):
+        await self._track()
+        if document["id"] % 7 == 0:
+            raise ValueError(f"bad document {document['id']}")
+        return self._enhance_document(document)
+
+
+def test_failed_bulk_calls_stay_within_max_concurrent():
+    pytest.importorskip("pocketflow")
+    module = load_example()
+
+    class Processor(CountingProcessor, module.AsyncDocumentProcessor):
+        pass
+
+    documents = [{"id": i, "content": f"doc {i}"} for i in range(40)]
+    processor = Processor()
+    prep_result = processor.prep(
+        {"documents": documents, "max_concurrent": 3, "max_batch": 8}
+    )
+
+    exec_result = asyncio.run(processor.exec_async(prep_result))
+
+    assert processor.peak_in_flight <= 3
+    assert exec_result["failure_count"] == len(range(0, 40, 7))
+    assert exec_result["success_count"] == 40 - exec_result["failure_count"]
+    assert [doc["original_id"] for doc in exec_result["processed_documents"]] == [
+        i for i in range(40) if i % 7
+    ]
+
+
+@pytest.mark.parametrize(
+    ("setting", "value"),
+    [
+        ("max_concurrent_per_shard", 0),
+        ("max_concurrent_per_shard", -2),
+        ("max_requests_per_second", 0),
+        ("max_requests_per_second", -1.5),
+    ],
+)
+def test_prep_rejects_non_positive_downstream_limits(example, setting, value):
+    processor = example.AsyncDocumentProcessor()
+
+    with pytest.raises(ValueError, match=setting):
+        processor.prep({"documents": [{"id": 1}], setting: value})
+
+
+def test_prep_defaults_shard_limit_to_clamped_max_concurrent(example):
+    processor = example.AsyncDocumentProcessor()
+
+    prep_result = processor.prep({"documents": [{"id": 1}], "max_concurrent": 0})
+
+    assert prep_result["max_concurrent_per_shard"] == 1
+    assert prep_result["max_requests_per_second"] is None
+
+
+def test_plan_batches_splits_shards_and_interleaves_them(example):
+    documents = [{"id": i, "shard": "a"} for i in range(5)] + [
+        {"id": 5, "shard": "b"},
+        {"id": 6},
+        "not a dict",
+    ]
+
+    planned = example.AsyncDocumentProcessor()._plan_batches(documents, 2)
+
+    assert planned == [
+        ("a", [0, 1]),
+        ("b", [5]),
+        ("default", [6, 7]),
+        ("a", [2, 3]),
+        ("a", [4]),
+    ]
+
+
+@pytest.mark.parametrize("returned", [3, 5])
+def test_bulk_results_of_the_wrong_length_fall_back_per_document(returned):
+    pytest.importorskip("pocketflow")
+    module = load_example()
+
+    class Processor(module.AsyncDocumentProcessor):
+        logger = logging.getLogger(__name__)
+
+        async def _process_document_batch_async(self, documents):
+            return [self._enhance_document(documents[0])] * returned
+
+        async def _process_document_async(self, document):
+            return self._enhance_document(document)
+
+    documents = [{"id": i, "content": f"doc {i}"} for i in range(4)]
+    processor = Processor()
+    prep_result = processor.prep({"documents": documents, "max_batch": 4})
+
+    exec_result = asyncio.run(processor.exec_async(prep_result))
+
+    assert exec_result["failure_count"] == 0
+    processed_ids = [doc["original_id"] for doc in exec_result["processed_documents"]]
+    assert processed_ids == list(range(4))
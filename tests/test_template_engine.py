@@ -0,0 +1,64 @@
+import os
+
+from pocketflow_tools.generators.template_engine import TemplateEngine
+from pocketflow_tools.generators.workflow_composer import PocketFlowGenerator
+
+
+def write_templates(templates_path, **templates):
+    templates_path.mkdir(exist_ok=True)
+    for name, content in templates.items():
+        (templates_path / f"{name}.md").write_text(content)
+
+
+def test_source_signature_is_stable_while_files_are_unchanged(tmp_path):
+    write_templates(tmp_path / "templates", design="# Design", tasks="# Tasks")
+    engine = TemplateEngine(tmp_path / "templates")
+
+    assert engine.source_signature() == engine.source_signature()
+
+
+def test_source_signature_tracks_template_mtime_size_and_set(tmp_path):
+    templates_path = tmp_path / "templates"
+    write_templates(templates_path, design="# Design")
+    engine = TemplateEngine(templates_path)
+    template = templates_path / "design.md"
+    seen = [engine.source_signature()]
+
+    # Same size, newer mtime
+    stat = template.stat()
+    os.utime(template, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    seen.append(engine.source_signature())
+
+    # Same mtime, different size
+    mtime_ns = template.stat().st_mtime_ns
+    template.write_text("# Design, longer")
+    os.utime(template, ns=(mtime_ns, mtime_ns))
+    seen.append(engine.source_signature())
+
+    # New template file
+    write_templates(templates_path, tasks="# Tasks")
+    seen.append(engine.source_signature())
+
+    assert len(set(seen)) == len(seen)
+
+
+def test_generator_reloads_templates_after_an_edit(tmp_path):
+    templates_path = tmp_path / "templates"
+    write_templates(templates_path, design="# Design v1")
+
+    def load():
+        return PocketFlowGenerator(
+            templates_path=str(templates_path), output_path=str(tmp_path / "out")
+        ).context.templates
+
+    first = load()
+    first["design"] = "edited by a caller"
+    assert load() == {"design": "# Design v1"}
+
+    template = templates_path / "design.md"
+    mtime_ns = template.stat().st_mtime_ns
+    template.write_text("# Design v2")
+    # Force a distinct mtime even on filesystems with coarse timestamps
+    os.utime(template, ns=(mtime_ns + 1_000_000, mtime_ns + 1_000_000))
+
+    assert load() == {"design": "# Design v2"}
@@ -0,0 +1,277 @@
+from __future__ import annotations
+
+import asyncio
+import importlib.util
+import json
+import re
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+
+EXAMPLE_PATH = (
+    Path(__file__).resolve().parent.parent
+    / "templates"
+    / "examples"
+    / "good"
+    / "utility_patterns.py"
+)
+
+
+def load_example():
+    spec = importlib.util.spec_from_file_location("utility_patterns", EXAMPLE_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+utility_patterns = load_example()
+
+
+# Reference implementations of the original per-record helpers, kept here to
+# check that the batch and compiled variants return exactly the same results
+def baseline_normalize_text(text, options=None):
+    if not text or not isinstance(text, str):
+        return ""
+
+    options = options or {}
+    result = text
+    if options.get("strip_whitespace", True):
+        result = result.strip()
+    if options.get("normalize_whitespace", True):
+        result = re.sub(r"\s+", " ", result)
+    if options.get("lower_case", False):
+        result = result.lower()
+    if options.get("remove_special_chars", False):
+        result = re.sub(r"[^\w\s]", "", result)
+    return result
+
+
+def baseline_validate_data_types(data, schema):
+    results = {}
+    for field, expected_type in schema.items():
+        if field in data:
+            value = data[field]
+            if expected_type == "email":
+                results[field] = bool(re.match(r"^[\w\.-]+@[\w\.-]+\.\w+$", str(value)))
+            else:
+                results[field] = isinstance(value, expected_type)
+        else:
+            results[field] = False
+    return results
+
+
+TEXTS = [
+    "",
+    None,
+    42,
+    "plain",
+    "  Hello    World!  \n\n  Extra   spaces  ",
+    "\tTabs\tand\nnewlines\r\n",
+    "Ünïcödé spaces here",
+    "Special #chars, here! (and) there?",
+    "already normalized text",
+]
+
+OPTIONS = [
+    None,
+    {},
+    {"strip_whitespace": False},
+    {"normalize_whitespace": False},
+    {"strip_whitespace": False, "normalize_whitespace": False},
+    {"lower_case": True},
+    {"remove_special_chars": True, "lower_case": True},
+    {"strip_whitespace": False, "remove_special_chars": True},
+]
+
+
+@pytest.mark.parametrize("options", OPTIONS)
+def test_normalize_text_batch_matches_per_item_results(options):
+    expected = [baseline_normalize_text(text, options) for text in TEXTS]
+
+    assert utility_patterns.normalize_text_batch(TEXTS, options) == expected
+    assert [utility_patterns.normalize_text(text, options) for text in TEXTS] == (
+        expected
+    )
+
+
+def test_compile_schema_matches_baseline_validation():
+    schema = {"name": str, "age": int, "email": "email", "score": (int, float)}
+    records = [
+        {"name": "John Doe", "age": 30, "email": "john@example.com", "score": 1.5},
+        {"name": 7, "age": "30", "email": "not-an-email", "score": "high"},
+        {"email": 12345},
+        {"age": True, "email": "a.b-c@d-e.org", "extra": None},
+        {},
+    ]
+
+    validate = utility_patterns.compile_schema(schema)
+
+    for record in records:
+        expected = baseline_validate_data_types(record, schema)
+        assert validate(record) == expected
+        assert utility_patterns.validate_data_types(record, schema) == expected
+
+
+def test_map_file_safe_maps_file_bytes(tmp_path):
+    path = tmp_path / "data.bin"
+    path.write_bytes(b"header\n" + bytes(range(256)) * 64)
+
+    mapped = utility_patterns.map_file_safe(path)
+
+    assert mapped is not None
+    with mapped:
+        assert mapped[:] == path.read_bytes()
+
+
+def test_map_file_safe_returns_none_for_empty_and_missing_files(tmp_path):
+    empty = tmp_path / "empty.txt"
+    empty.write_bytes(b"")
+
+    assert utility_patterns.map_file_safe(empty) is None
+    assert utility_patterns.map_file_safe(tmp_path / "missing.txt") is None
+
+
+def test_list_files_with_extension_matches_glob(tmp_path):
+    for name in ("a.txt", "b.TXT", "c.txt.bak", "d.md", ".hidden.txt"):
+        (tmp_path / name).write_text(name)
+    (tmp_path / "dir.txt").mkdir()
+
+    for extension in ("txt", ".txt", "md"):
+        listed = utility_patterns.list_files_with_extension(tmp_path, extension)
+        globbed = tmp_path.glob(f"*.{extension.lstrip('.')}")
+        assert sorted(listed) == sorted(path for path in globbed if path.is_file())
+
+
+def test_list_files_with_extension_returns_empty_for_unlistable_paths(
+    tmp_path, monkeypatch
+):
+    (tmp_path / "file.txt").write_text("")
+
+    assert utility_patterns.list_files_with_extension(tmp_path / "missing", "txt") == []
+    assert (
+        utility_patterns.list_files_with_extension(tmp_path / "file.txt", "txt") == []
+    )
+
+    def unreadable(path):
+        raise PermissionError(13, "Permission denied", str(path))
+
+    monkeypatch.setattr(utility_patterns.os, "scandir", unreadable)
+    assert utility_patterns.list_files_with_extension(tmp_path, "txt") == []
+
+
+class EchoHandler(BaseHTTPRequestHandler):
+    """Echo the request back as JSON and always try to set a cookie."""
+
+    def _respond(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length) if length else b""
+        payload = json.dumps(
+            {
+                "method": self.command,
+                "path": self.path,
+                "authorization": self.headers.get("Authorization"),
+                "cookie": self.headers.get("Cookie"),
+                "body": json.loads(body) if body else None,
+            }
+        ).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Set-Cookie", "session=abc; Path=/")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    do_GET = do_POST = do_PUT = _respond
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def echo_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), EchoHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_port}"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_pooled_session_does_not_carry_cookies_between_calls(echo_server):
+    first = utility_patterns.make_http_request(f"{echo_server}/first")
+    second = utility_patterns.make_http_request(f"{echo_server}/second")
+
+    assert first["success"] and second["success"]
+    assert second["data"]["cookie"] is None
+
+
+def test_async_requests_match_sync_results(echo_server):
+    httpx = pytest.importorskip("httpx")
+    assert httpx is utility_patterns.httpx
+
+    async def run():
+        try:
+            return (
+                await utility_patterns.make_http_request_async(
+                    f"{echo_server}/items", method="put", data={"id": 1}
+                ),
+                await utility_patterns.call_external_api_async(
+                    f"{echo_server}/api", {"query": "q"}, api_key="secret"
+                ),
+                await utility_patterns.make_http_request_async(
+                    echo_server, method="DELETE"
+                ),
+            )
+        finally:
+            await utility_patterns._get_async_http_client().aclose()
+
+    put_result, api_result, unsupported = asyncio.run(run())
+
+    sync_put = utility_patterns.make_http_request(
+        f"{echo_server}/items", method="put", data={"id": 1}
+    )
+    sync_api = utility_patterns.call_external_api(
+        f"{echo_server}/api", {"query": "q"}, api_key="secret"
+    )
+    assert put_result["data"] == sync_put["data"]
+    assert api_result["data"] == sync_api["data"]
+    assert api_result["data"]["authorization"] == "Bearer secret"
+    assert api_result["data"]["body"] == {"query": "q"}
+    assert unsupported is None
+
+
+def test_async_request_returns_none_for_an_invalid_url():
+    pytest.importorskip("httpx")
+
+    async def run():
+        try:
+            return await utility_patterns.make_http_request_async("http://[::1")
+        finally:
+            await utility_patterns._get_async_http_client().aclose()
+
+    assert utility_patterns.make_http_request("http://[::1") is None
+    assert asyncio.run(run()) is None
+
+
+def test_async_client_is_reused_within_an_event_loop_only():
+    pytest.importorskip("httpx")
+
+    async def clients_for_one_loop():
+        first = utility_patterns._get_async_http_client()
+        second = utility_patterns._get_async_http_client()
+        await first.aclose()
+        # A closed client is replaced rather than handed out again
+        replacement = utility_patterns._get_async_http_client()
+        await replacement.aclose()
+        return first, second, replacement
+
+    first, second, replacement = asyncio.run(clients_for_one_loop())
+    other_loop_client, _, _ = asyncio.run(clients_for_one_loop())
+
+    assert first is second
+    assert replacement is not first
+    assert other_loop_client is not first
@@ -0,0 +1,80 @@
+from datetime import date
+
+import pytest
+from pocketflow_tools.generators import doc_generators, workflow_composer
+from pocketflow_tools.generators.workflow_composer import PocketFlowGenerator
+from pocketflow_tools.spec import WorkflowSpec
+
+
+@pytest.fixture
+def generator(tmp_path):
+    return PocketFlowGenerator(
+        templates_path=str(tmp_path / "templates"), output_path=str(tmp_path / "out")
+    )
+
+
+def make_spec(**overrides):
+    fields = {
+        "name": "Doc Search",
+        "pattern": "RAG",
+        "description": "Answer questions from documents",
+        "nodes": [
+            {"name": "Retriever", "type": "Node", "description": "Find documents"},
+            {"name": "Answerer", "type": "Node", "description": "Write the answer"},
+        ],
+    }
+    fields.update(overrides)
+    return WorkflowSpec(**fields)
+
+
+def test_equal_specs_render_equal_but_independent_files(generator):
+    first = generator.generate_workflow(make_spec())
+    first["nodes.py"] = "edited by a caller"
+    second = generator.generate_workflow(make_spec())
+
+    assert second is not first
+    assert second["nodes.py"] != "edited by a caller"
+    assert second == workflow_composer._render_workflow_files(
+        generator._enrich_spec_with_pattern_nodes(
+            generator._detect_batch_patterns(make_spec())
+        )
+    )
+
+
+def test_mutating_a_spec_renders_it_again(generator):
+    spec = make_spec()
+    before = generator.generate_workflow(spec)
+
+    spec.nodes[0]["description"] = "Find documents by keyword"
+    after = generator.generate_workflow(spec)
+
+    assert "Find documents by keyword" not in before["nodes.py"]
+    assert "Find documents by keyword" in after["nodes.py"]
+
+
+def test_enrichment_still_updates_the_spec_on_a_cache_hit(generator):
+    generator.generate_workflow(make_spec(nodes=[]))
+    spec = make_spec(nodes=[])
+
+    generator.generate_workflow(spec)
+
+    assert [node["name"] for node in spec.nodes][:2] == [
+        "DocumentLoader",
+        "TextChunker",
+    ]
+    assert spec.utilities and spec.api_endpoints and spec.shared_store_schema
+
+
+def test_render_date_keys_the_cache(generator, monkeypatch):
+    class Tomorrow(date):
+        @classmethod
+        def today(cls):
+            return date.fromordinal(date.today().toordinal() + 1)
+
+    today_files = generator.generate_workflow(make_spec())
+    monkeypatch.setattr(workflow_composer, "date", Tomorrow)
+    monkeypatch.setattr(doc_generators, "date", Tomorrow)
+    tomorrow_files = generator.generate_workflow(make_spec())
+
+    assert today_files != tomorrow_files
+    assert Tomorrow.today().isoformat() in "".join(tomorrow_files.values())